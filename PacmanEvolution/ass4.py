@@ -1,21 +1,27 @@
 # Noah van der Vleuten (s1018323)
 # Jozef Coldenhoff (s1017656)
 
+import collections
 import exceptions
+import itertools
+import math
 import random
 
 from pacman import agents, gamestate, util
 
+# flags of transposition table entries of the alpha-beta search
+EXACT, LOWER_BOUND, UPPER_BOUND = range(3)
+
+# pool of noise terms for better_evaluate, drawn once instead of at every evaluation; a private generator with a fixed
+# seed keeps the global random state untouched and makes the same games play out the same way on every run
+_noise_random = random.Random(0)
+NOISE = itertools.cycle([1 / _noise_random.randint(10, 30) for _ in range(1 << 16)])
+
 
 class BetterReflexAgent(agents.ReflexAgent):
     def evaluate(self, gstate, move):
         # Get the next moves of Pacman.
         next_position = gstate.pacman + move.vector
-        score = 0  # Initialize the score.
-
-        # Calculate the distance to all the food.
-        distance_to_dots = [util.manhattan(x, next_position) for x in gstate.dots.list()]
-        distance_to_dots.sort()  # Sort the distances in ascending order.
 
         for ghost in gstate.ghosts:
 
@@ -29,84 +35,118 @@ class BetterReflexAgent(agents.ReflexAgent):
             if next_position in individual_ghost_position:
                 # If not return minus infinity, meaning Pacman will try not to do this if there are other options.
                 return float('-inf')
-            if gstate.dots[next_position]:
-                score += float('inf')
 
-        # Subtract the distance to the closest dot off of the score.
-        score -= distance_to_dots[0]
-        return score
+        # If the move is safe and eats a dot there is no need to look any further.
+        dots = gstate.dot_list
+        if next_position in dots:
+            return float('inf')
+
+        # Subtract the distance to the closest food off of the score.
+        next_x, next_y = next_position
+        return -min(abs(x - next_x) + abs(y - next_y) for x, y in dots)
 
 
 class MinimaxAgent(agents.AdversarialAgent):
     def move(self, gstate):
+        # transposition table from (gamestate key, depth, maximizer) to (score, move), fresh for every move
+        self.transpositions = {}
         score, best_move = self.minimax(gstate, self.depth, True)
         return best_move
 
     def minimax(self, gstate, depth, maximizer):
 
         # if we are in a leaf node or the game is a loss or win we just return the evaluation of that node
-        if depth is 0 or gstate.loss or gstate.win:
+        if depth == 0 or gstate.gameover:
             return self.evaluate(gstate), util.Move.stop
 
+        # if this gamestate was already searched at this depth we reuse its result
+        key = gstate.key, depth, maximizer
+        if key in self.transpositions:
+            return self.transpositions[key]
+
         # if the current agent is a maximizer execute the following code
         if maximizer:
+            # initialise the best score and action
+            best_score, best_action = float('-inf'), util.Move.stop
 
-            # gets all legal actions of Pacman
-            legal_actions = list(gstate.legal_moves_id(0))
-
-            # makes a list of all the scores of the successors recursively
-            scores = [self.minimax(gstate.successor(0, x), depth, False)[0] for x in legal_actions]
+            # loops through all legal actions of Pacman, scoring their successors recursively
+            # (each move is made on the gamestate itself and undone afterwards, instead of copying it)
+            for move in gstate.legal_moves_id(0):
+                undo = gstate.make_move(0, move)
+                score = self.minimax(gstate, depth, False)[0]
+                gstate.unmake_move(undo)
 
-            # takes the maximum found score in the list
-            best_score = max(scores)
-
-            # takes all the indexes of the best scores and fills a list with the corresponding moves
-            best_actions = [x for x in range(len(scores)) if scores[x] is best_score]
-
-            # returns a random move of the moves with the best score and the score itself
-            return best_score, legal_actions[random.choice(best_actions)]
+                # keeps track of the maximum score and its move so far
+                if score > best_score:
+                    best_score, best_action = score, move
 
         # if the current agent is a minimizer execute the following code
         else:
+            # initialise the best score and action
+            best_score, best_action = float('inf'), util.Move.stop
 
-            # gets all legal actions of the ghost
-            legal_actions = list(gstate.legal_moves_id(1))
+            # loops through all legal actions of the ghost, scoring their successors recursively
+            for move in gstate.legal_moves_id(1):
+                undo = gstate.make_move(1, move)
+                score = self.minimax(gstate, depth - 1, True)[0]
+                gstate.unmake_move(undo)
 
-            # makes a list of all the scores of the successors recursively
-            scores = [self.minimax(gstate.successor(1, x), depth - 1, True)[0] for x in legal_actions]
-
-            # takes the minimum found score in the list
-            best_score = min(scores)
-
-            # takes all the indexes of the best scores and fills a list with the corresponding moves
-            best_actions = [x for x in range(len(scores)) if scores[x] is best_score]
+                # keeps track of the minimum score and its move so far
+                if score < best_score:
+                    best_score, best_action = score, move
 
-            # returns a random move of the moves with the best score and the score itself
-            return best_score, legal_actions[random.choice(best_actions)]
+        # stores and returns the best move and its score
+        self.transpositions[key] = best_score, best_action
+        return best_score, best_action
 
 
 class AlphabetaAgent(agents.AdversarialAgent):
     def move(self, gstate):
+        # transposition table from (gamestate key, depth, maximizer) to (score, move, flag), fresh for every move
+        self.transpositions = {}
         score, best_move = self.alpha_beta(gstate, self.depth, True, float('-inf'), float('inf'))
         return best_move
 
     def alpha_beta(self, gstate, depth, maximizer, alpha, beta):
         # if we are in a leaf node or the game is a loss or win we just return the evaluation of that node
-        if depth is 0 or gstate.loss or gstate.win:
+        if depth == 0 or gstate.gameover:
             return self.evaluate(gstate), util.Move.stop
 
+        # if this gamestate was already searched at this depth we reuse its result, which is either
+        # the exact score or a bound on it, depending on the window it was searched with
+        key = gstate.key, depth, maximizer
+        stored_action = None
+        if key in self.transpositions:
+            stored_score, stored_action, flag = self.transpositions[key]
+            if flag == EXACT:
+                return stored_score, stored_action
+            elif flag == LOWER_BOUND:
+                alpha = max(stored_score, alpha)
+            else:
+                beta = min(stored_score, beta)
+            if beta <= alpha:
+                return stored_score, stored_action
+        original_alpha, original_beta = alpha, beta
+
+        # orders the legal actions of the current agent from most to least promising for that agent, so that
+        # the branches which cause pruning are searched first, the best action found before goes first of all
+        agent_id = 0 if maximizer else 1
+        legal_actions = sorted(gstate.legal_moves_id(agent_id), key=lambda move: move_order(gstate, agent_id, move))
+        if stored_action is not None:
+            legal_actions.sort(key=lambda move: move != stored_action)
+
         # if the current agent is a maximizer execute the following code
         if maximizer:
-            # gets all legal actions of Pacman
-            legal_actions = list(gstate.legal_moves_id(0))
             # initialise the best score
             best_score = float('-inf')
             # initialise the best action
             best_action = util.Move.stop
             # loop through the actions
             for move in legal_actions:
-                # generates the score associated with the move recursively
-                score = self.alpha_beta(gstate.successor(0, move), depth, False, alpha, beta)[0]
+                # generates the score associated with the move recursively, making and undoing it on the gamestate
+                undo = gstate.make_move(0, move)
+                score = self.alpha_beta(gstate, depth, False, alpha, beta)[0]
+                gstate.unmake_move(undo)
                 # keeps track of the best score and move so far
                 if score > best_score:
                     best_score = score
@@ -116,20 +156,19 @@ class AlphabetaAgent(agents.AdversarialAgent):
                 # prunes the branch if possible
                 if beta <= alpha:
                     break
-            return best_score, best_action
 
         # if the current agent is a minimizer execute the following code
         else:
-            # gets all legal actions of the ghost
-            legal_actions = list(gstate.legal_moves_id(1))
             # initialise the best score
             best_score = float('inf')
             # initialise the best action
             best_action = util.Move.stop
             # loop through the actions
             for move in legal_actions:
-                # generates the score associated with the move recursively
-                score = self.alpha_beta(gstate.successor(1, move), depth - 1, True, alpha, beta)[0]
+                # generates the score associated with the move recursively, making and undoing it on the gamestate
+                undo = gstate.make_move(1, move)
+                score = self.alpha_beta(gstate, depth - 1, True, alpha, beta)[0]
+                gstate.unmake_move(undo)
                 # keeps track of the best score and move so far
                 if score < best_score:
                     best_score = score
@@ -139,7 +178,34 @@ class AlphabetaAgent(agents.AdversarialAgent):
                 # prunes the branch if possible
                 if beta <= alpha:
                     break
-            return best_score, best_action
+
+        # stores the result together with whether it is exact or only a bound because of pruning
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= original_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.transpositions[key] = best_score, best_action, flag
+        return best_score, best_action
+
+
+def move_order(gstate, agent_id, move):
+    # cheap estimate of how promising a move is, lower is better: Pacman wants to eat a dot or get close
+    # to one, the ghost wants to get close to Pacman
+    x, y = gstate.agents[agent_id] + move.vector
+    if agent_id == 0:
+        dots = gstate.dot_list
+        if not dots or (x, y) in dots:
+            return 0
+        return min(abs(x - dot_x) + abs(y - dot_y) for dot_x, dot_y in dots)
+    pacman_x, pacman_y = gstate.pacman
+    return abs(x - pacman_x) + abs(y - pacman_y)
+
+
+def closest_euclidean(positions, position):
+    # the euclidean distance from the position to the closest of the positions, the whole loop runs inside builtins
+    return min(map(math.dist, positions, itertools.repeat(position)))
 
 
 def better_evaluate(gstate):
@@ -148,25 +214,26 @@ def better_evaluate(gstate):
     if gstate.loss:
         return float('-inf')
 
+    # Every check below is answered once per call, instead of building the pellet indicators up to three times.
+    pellets = gstate.pellets
+    dot_list = gstate.dot_list
+    scared = gstate.timers[0] > 0
+
     # This makes sure that Pacman doesn't win while the ghost can still be killed
-    elif gstate.win and (gstate.pellets or gstate.timers[0] > 0):
+    if not dot_list and (pellets or scared):
         return 0
 
     # This makes sure that if the ghost is scared Pacman will go to the ghost and try to kill it
-    elif gstate.timers[0] > 0:
-        return (1 / util.euclidean(gstate.pacman, gstate.agents[1])) + gstate.score + 1 / random.randint(10, 30)
+    elif scared:
+        return (1 / util.euclidean(gstate.pacman, gstate.agents[1])) + gstate.score + next(NOISE)
 
     # If there are still pellets in the game Pacman will go to the nearest one
-    elif gstate.pellets and not gstate.timers[0] > 0:
-        pellets = [util.euclidean(x, gstate.pacman) for x in gstate.pellets.list()]
-        pellets.sort()
-        return 1 / pellets[0] + gstate.score + 1 / random.randint(10, 30)
+    elif pellets:
+        return 1 / closest_euclidean(pellets.list(), gstate.pacman) + gstate.score + next(NOISE)
 
     # If Pacman used all pellets and killed the ghost as much at possible it will move to the nearest dot
-    elif gstate.dots:
-        dots = gstate.dots.list()
-        dots.sort(key=lambda x: util.euclidean(x, gstate.pacman))
-        return 1 / util.euclidean(gstate.pacman, dots[0]) + gstate.score + 1 / random.randint(10, 30)
+    elif dot_list:
+        return 1 / closest_euclidean(dot_list, gstate.pacman) + gstate.score + next(NOISE)
 
     # PS we add some noise to all the evaluations to make sure Pacman doesnt get stuck in a loop of moves
     return gstate.score
@@ -175,72 +242,87 @@ def better_evaluate(gstate):
 
 class MultiAlphabetaAgent(agents.AdversarialAgent):
     def move(self, gstate):
+        # Killer moves: for every (depth, agent_number) the latest moves that caused a prune there, fresh for every move.
+        self.killers = collections.defaultdict(list)
         # Initial values of alpha and beta will be minus and plus infinity respectively.
         score, move = self.alpha_score(gstate, float('-inf'), float('inf'), 0, self.depth)
         return move
 
+    def order_moves(self, moves, agent_number, depth):
+        # Search the killer moves of this level first, they are likely to cause a prune again.
+        killers = self.killers[depth, agent_number]
+        if not killers:
+            return list(moves)
+        return sorted(moves, key=lambda move: killers.index(move) if move in killers else len(killers))
+
+    def add_killer(self, move, agent_number, depth):
+        # Remember the move that caused a prune, keeping only the two latest killer moves of each level.
+        killers = self.killers[depth, agent_number]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[2:]
+
     # Pacman is the maximizer:
     def alpha_score(self, state, alpha, beta, agent_number, depth):
         # Once we've reached this state we're done here.
-        if state.win or state.loss:
+        if state.gameover:
             return self.evaluate(state), 'none'
 
         # Initially set the score to minus infinity.
         score = float('-inf')
 
         # Gather the legal moves of Pacman.
-        moves = list(state.legal_moves_id(agent_number))
+        moves = self.order_moves(state.legal_moves_id(agent_number), agent_number, depth)
         # Initiate the best_moves variable (with the first possible move).
         best_move = moves[0]
 
         # For all the moves it has collected:
         for move in moves:
-            former_score = score  # save the old score.
-            succ_gstate = state.successor(agent_number, move)  # get the successor state by applying this move.
+            # Get the successor state by applying this move to the state itself, it is undone once scored.
+            undo = state.make_move(agent_number, move)
 
             # If the game finishes or all leaf nodes.
-            if succ_gstate.win or succ_gstate.loss or depth == 0:
-                score = max(score, self.evaluate(succ_gstate))  # get the max score of the leaf nodes.
+            if state.gameover or depth == 0:
+                move_score = self.evaluate(state)  # get the score of the leaf node.
             else:
                 # Else move over to the ghosts.
-                score = max(score, self.beta_score(succ_gstate, alpha, beta, agent_number + 1, depth))
+                move_score = self.beta_score(state, alpha, beta, agent_number + 1, depth)
+            state.unmake_move(undo)
+
+            if move_score > score:
+                score, best_move = move_score, move  # Save the best move out of the pruning process.
 
             if score > beta:  # Check the ability to prune.
+                self.add_killer(move, agent_number, depth)
                 return score, move
 
             alpha = max(alpha, score)
-            if score != former_score:
-                best_move = move  # Save the best move out of the pruning process.
         return score, best_move
 
     # Ghosts are the minimizer:
     def beta_score(self, state, alpha, beta, agent_number, depth):
         # Once we've reached this state we're done here.
-        if state.win or state.loss:
+        if state.gameover:
             return self.evaluate(state), 'none'
 
         score = float('inf')
-        moves = state.legal_moves_id(agent_number)
-        has_decremented = False
+        moves = self.order_moves(state.legal_moves_id(agent_number), agent_number, depth)
+        # After the last agent (ghost) in the list it is Pacman's turn again, one level deeper.
+        last_ghost = agent_number == (len(state.agents) - 1)
 
         for move in moves:
-            succ_gstate = state.successor(agent_number, move)
-            if depth == 0 or succ_gstate.win or succ_gstate.loss:
-                score = min(score, self.evaluate(succ_gstate))
-            # Else if this is the last agent (ghost) in the list:
-            elif agent_number == (len(state.agents) - 1):
-                # We don't want to decrement the depth of the same level more than once, so we use has_decremented.
-                if not has_decremented:
-                    depth -= 1  # Decrement the depth.
-                    has_decremented = True
-                if depth == 0:  # If we're at the deepest level check the minimum value of these successors.
-                    score = min(score, self.evaluate(succ_gstate))
-                else:
-                    score = min(score, self.alpha_score(succ_gstate, alpha, beta, 0, depth)[0])
-
+            undo = state.make_move(agent_number, move)
+            # If we're at the deepest level (or will be after this ghost), check the minimum value of these successors.
+            if depth == 0 or (last_ghost and depth == 1) or state.gameover:
+                score = min(score, self.evaluate(state))
+            elif last_ghost:
+                score = min(score, self.alpha_score(state, alpha, beta, 0, depth - 1)[0])
             else:
-                score = min(score, self.beta_score(succ_gstate, alpha, beta, agent_number + 1, depth))
+                score = min(score, self.beta_score(state, alpha, beta, agent_number + 1, depth))
+            state.unmake_move(undo)
             if score < alpha:  # Checking pruning again.
+                self.add_killer(move, agent_number, depth)
                 return score
 
             beta = min(beta, score)
@@ -6,11 +6,13 @@ import exceptions
 import numbers
 import random
 from pacman import agents, gamestate, util, distancer
-import collections
 
 
 import neat
 
+# the moves whose legality is given to the neural net, in the order of its inputs (and outputs)
+NETWORK_MOVES = (util.Move.up, util.Move.down, util.Move.right, util.Move.left)
+
 
 class ContestAgent(agents.PacmanAgent):
 
@@ -24,12 +26,12 @@ class ContestAgent(agents.PacmanAgent):
         super().prepare(gstate)
 
         # precompute distances:
-        self.distances = collections.defaultdict(lambda: float('inf'))
         self.distances = distancer.Distancer(gstate)
         self.distances.precompute_distances()
 
-        # initialize network
+        # initialize network, and the input buffer that is filled again every turn
         self.net = neat.nn.recurrent.RecurrentNetwork.create(genome, config)
+        self.network_input = [0] * config.genome_config.num_inputs
 
     def move(self, gstate: gamestate.Gamestate) -> util.Move:
         """
@@ -37,12 +39,21 @@ class ContestAgent(agents.PacmanAgent):
         what move they want to make based on the current gamestate.
         """
 
+        # Get Pacman's legal moves once, they are needed for both the input and the output of the neural net.
+        legal_moves = set(gstate.legal_moves_id(0))
+
+        pacman = gstate.pacman
+        # all distances from Pacman at once, unreachable positions are infinitely far away
+        distances_from_pacman = self.distances.distances_from.get(pacman, {})
+
+        def distance(position):
+            return distances_from_pacman.get(position, float('inf'))
+
         # Get distance to closest dot.
-        closest_dot = [[(self.distances.get_distance(gstate.pacman, dot_pos), dot_pos)] for dot_pos in gstate.dots.list()]
-        closest_dot = min(closest_dot)
+        closest_dot = min(gstate.dot_list, key=distance)  # the cached list, not a new one
 
-        closest_dot_x, closest_dot_y = closest_dot[0][1] - gstate.pacman
-        # closest_dot_dist = closest_dot[0][0]
+        closest_dot_x, closest_dot_y = closest_dot - pacman
+        # closest_dot_dist = distances_from_pacman[closest_dot]
 
         closest_ghost_x = 0
         closest_ghost_y = 0
@@ -50,61 +61,30 @@ class ContestAgent(agents.PacmanAgent):
 
         if gstate.ghosts:
             # Get distance to closest ghost.
-            closest_ghost = [[(self.distances.get_distance(gstate.pacman, ghost_pos), ghost_pos)] for ghost_pos in gstate.ghosts]
-            closest_ghost = min(closest_ghost)
-
-            closest_ghost_x, closest_ghost_y = closest_ghost[0][1] - gstate.pacman
-            closest_ghost_dist = closest_ghost[0][0]
-
-        moves = []
+            # equidistant ghosts are broken by position, as the network was trained with
+            closest_ghost = min(gstate.ghosts, key=lambda ghost: (distance(ghost), ghost))
 
-        if util.Move.up in gstate.legal_moves_id(0):
-            moves.append(1)
-        else:
-            moves.append(0)
-
-        if util.Move.down in gstate.legal_moves_id(0):
-            moves.append(1)
-        else:
-            moves.append(0)
-
-        if util.Move.right in gstate.legal_moves_id(0):
-            moves.append(1)
-        else:
-            moves.append(0)
-
-        if util.Move.left in gstate.legal_moves_id(0):
-            moves.append(1)
-        else:
-            moves.append(0)
+            closest_ghost_x, closest_ghost_y = closest_ghost - pacman
+            closest_ghost_dist = distance(closest_ghost)
 
         # Give the neural net input.
-        network_input = (moves[0], moves[1], moves[2], moves[3],
-                         closest_ghost_x, closest_ghost_y, closest_ghost_dist,
-                         closest_dot_x, closest_dot_y)
+        self.network_input[:4] = [int(move in legal_moves) for move in NETWORK_MOVES]
+        self.network_input[4:] = (closest_ghost_x, closest_ghost_y, closest_ghost_dist,
+                                  closest_dot_x, closest_dot_y)
 
         # Get network output
-        network_output = self.net.activate(network_input)
+        network_output = self.net.activate(self.network_input)
 
-        best_index = 0
-        best_score = 0
-
-        for index, score in enumerate(network_output):
-            if score > best_score:
-                best_index = index
-                best_score = score
-
-        # Check what move we have to return based on which output is highest:
+        # Check what move we have to return based on which output is highest (also when all outputs are negative):
         # 0: UP
         # 1: DOWN
         # 2: RIGHT
         # 3: LEFT
-        best_move = util.Move.by_index(best_index)
+        best_index = max(range(len(network_output)), key=network_output.__getitem__)
+        best_move = NETWORK_MOVES[best_index]
 
         # Check if the "best" move is not to go in the wall.
         # We should punish the agent immediately but it can't see the walls yet.
-        legal_moves = gstate.legal_moves_id(0)
-
         if best_move not in legal_moves:
             return util.Move.stop
 
@@ -115,5 +95,7 @@ class ContestAgent(agents.PacmanAgent):
         """
         Not needed for this implementation I think because the network does the evaluation itself
         """
-        successor = gstate.successor(self.id, move)
-        return successor.score
+        undo = gstate.make_move(self.id, move)  # inspect the move in-place instead of copying the gamestate
+        score = gstate.score
+        gstate.unmake_move(undo)
+        return score
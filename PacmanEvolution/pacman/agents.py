@@ -3,6 +3,9 @@ This file describes the agents that are available in the Pacman game.
 """
 
 import abc
+import bisect
+import collections
+import itertools
 import numbers
 import random
 from typing import Any, Callable, List, Type, Union
@@ -62,7 +65,7 @@ class PacmanAgent(Agent, abc.ABC):
         allows the agent to make any necessary preparations
         based on the initial gamestate.
         """
-        self._cell_values = array.Array([[None] * gstate.shape.y for _ in range(gstate.shape.x)])
+        self._cell_values = array.Array.full(gstate.shape, None)
 
     @abc.abstractmethod
     def move(self, gstate: gamestate.Gamestate) -> util.Move:
@@ -170,7 +173,9 @@ class SearchAgent(PacmanAgent):
         # of running the Search Method and getting
         # the list of actions that it will execute
         representation = self.representation_type(gstate)
-        self.actions = self.run_search(representation)
+        actions = self.run_search(representation)
+        # a deque allows popping the next move in constant time
+        self.actions = collections.deque(actions) if actions is not None else None
         self._cell_values = representation.expansion_order
 
         if self.actions is not None:
@@ -188,7 +193,7 @@ class SearchAgent(PacmanAgent):
         # the SearchAgent uses the list of actions that
         # it calculated in `prepare` to give each move in order
         if self.actions:
-            return self.actions.pop(0)
+            return self.actions.popleft()
         else:
             return util.Move.stop
 
@@ -258,7 +263,7 @@ class ReflexAgent(PacmanAgent, abc.ABC):
         what move they want to make based on the current gamestate.
         """
         moves = gstate.legal_moves_vector(gstate.agents[self.id])
-        scores = {move: self.evaluate(gstate.copy, move) for move in moves}
+        scores = {move: self.evaluate(gstate, move) for move in moves}
         max_score = max(scores.values())
         max_moves = [move for move in moves if scores[move] == max_score]
         return random.choice(max_moves)
@@ -268,6 +273,7 @@ class ReflexAgent(PacmanAgent, abc.ABC):
         """
         This method is used by the reflex agent to determine
         the value of a given move if it would be used in a given gamestate.
+        The same gamestate is passed for every move, so it must be left unchanged.
         """
         pass
 
@@ -283,8 +289,10 @@ class ScoreReflexAgent(ReflexAgent):
         This method is used by the reflex agent to determine
         the value of a given move if it would be used in a given gamestate.
         """
-        successor = gstate.successor(self.id, move)
-        return successor.score
+        undo = gstate.make_move(self.id, move)  # inspect the move in-place instead of copying the gamestate
+        score = gstate.score
+        gstate.unmake_move(undo)
+        return score
 
 
 """
@@ -336,6 +344,19 @@ class GhostAgent(Agent, abc.ABC):
     These agents are meant to control the ghosts in the Pacman world.
     """
 
+    def __init__(self, agent_id):
+        super().__init__(agent_id)
+        self._valid_moves = {}
+
+    def prepare(self, gstate: gamestate.Gamestate) -> None:
+        """
+        Called before the start of a game, this method
+        allows the agent to make any necessary preparations
+        based on the initial gamestate.
+        """
+        # the valid moves only depend on the walls, so they are remembered during a game
+        self._valid_moves = {}
+
     def move(self, gstate: gamestate.Gamestate) -> util.Move:
         """
         This method gets called every turn, asking the agent
@@ -344,7 +365,9 @@ class GhostAgent(Agent, abc.ABC):
         options, weights = self.distribution(gstate)
         if not options:
             return util.Move.stop
-        return random.choices(options, weights).pop()
+        # sample like `random.choices(options, weights)`, which draws the same move but has more overhead per call
+        cum_weights = list(itertools.accumulate(weights))
+        return options[bisect.bisect(cum_weights, random.random() * cum_weights[-1], 0, len(cum_weights) - 1)]
 
     @abc.abstractmethod
     def distribution(self, gstate: gamestate.Gamestate) -> util.Distribution:
@@ -360,14 +383,16 @@ class GhostAgent(Agent, abc.ABC):
         This method returns the valid moves for a ghost agent.
         A ghost cannot move backwards in a corridor, except when
         that is the only move to make (a dead end).
+        The resulting set is remembered for the location and facing, so it must not be modified.
         """
         vector = gstate.agents[self.id]
         facing = gstate.facings[self.id]
-        legal_moves = set(gstate.legal_moves_vector(vector)) - {util.Move.stop}
-        if len(legal_moves) == 1:
-            return legal_moves
-        else:
-            return set(legal_moves) - {facing.opposite}
+        if (vector, facing) not in self._valid_moves:
+            legal_moves = set(gstate.legal_moves_vector(vector)) - {util.Move.stop}
+            if len(legal_moves) > 1:
+                legal_moves -= {facing.opposite}
+            self._valid_moves[vector, facing] = legal_moves
+        return self._valid_moves[vector, facing]
 
 
 class RandomGhostAgent(GhostAgent):
@@ -376,14 +401,27 @@ class RandomGhostAgent(GhostAgent):
     possible moves, effectively making their next move random.
     """
 
+    def __init__(self, agent_id):
+        super().__init__(agent_id)
+        self._distributions = {}
+
+    def prepare(self, gstate: gamestate.Gamestate) -> None:
+        super().prepare(gstate)
+        # like the valid moves, the distribution only depends on the location and facing
+        self._distributions = {}
+
     def distribution(self, gstate: gamestate.Gamestate) -> util.Distribution:
         """
         Based on the given gamestate, this method returns a Distribution
         over moves that the agent might make, with the value of each move
         representing the probability that the agent should make that move.
+        The resulting lists are remembered for the location and facing, so they must not be modified.
         """
-        options = self.valid_moves(gstate)
-        return list(options), [1] * len(options)
+        key = gstate.agents[self.id], gstate.facings[self.id]
+        if key not in self._distributions:
+            options = self.valid_moves(gstate)
+            self._distributions[key] = list(options), [1] * len(options)
+        return self._distributions[key]
 
 class ChasingGhostAgent(GhostAgent):
     """
@@ -399,22 +437,21 @@ class ChasingGhostAgent(GhostAgent):
         is_scared = gstate.timers[self.id - 1]
 
         # Divide random_probability among all moves
-        moves = self.valid_moves(gstate)
-        distr = dict((move, self.random_probability / len(moves)) for move in moves)
+        moves = list(self.valid_moves(gstate))
+        random_share = self.random_probability / len(moves)
 
         # Divide 1-random_probability over all best moves (towards or away from player depending on scared timer)
-        player_distances = [util.manhattan(player_position, ghost_position + move.vector) for move in moves]
+        offset_x, offset_y = ghost_position - player_position
+        player_distances = [abs(offset_x + move.dx) + abs(offset_y + move.dy) for move in moves]
         if is_scared:
             best_dist = max(player_distances)
         else:
             best_dist = min(player_distances)
-        best_actions = [move for move, dist in zip(moves, player_distances) if dist == best_dist]
+        best_share = (1 - self.random_probability) / player_distances.count(best_dist)
 
-        for move, dist in zip(moves, player_distances):
-            if move in best_actions:
-                distr[move] += (1 - self.random_probability) / len(best_actions)
-
-        return list(distr.keys()), list(distr.values())
+        # the weights are built alongside the moves, instead of in a dict that is then split up again
+        weights = [random_share + best_share if dist == best_dist else random_share for dist in player_distances]
+        return moves, weights
 
 
 class TrackGhostAgent(GhostAgent):
@@ -424,7 +461,11 @@ class TrackGhostAgent(GhostAgent):
     track_length = 10  # indication, not a guarantee
 
     def prepare(self, gstate: gamestate.Gamestate):
+        super().prepare(gstate)
         self.track_moves, self.track_positions = self.generate_random_track(gstate, self.track_length)
+        self.track_indices = {}  # the first index of each position on the track, as `track_positions.index` gives
+        for index, position in enumerate(self.track_positions):
+            self.track_indices.setdefault(position, index)
         self.track_index = 0
         self.track_error = False
 
@@ -438,13 +479,13 @@ class TrackGhostAgent(GhostAgent):
         else:
             # Cannot continue on track; try to get back, otherwise wander randomly
             position = gstate.agents[self.id]
-            back_on_track_moves = [move for move in moves if position + move.vector in self.track_positions and move
-                                   != self.track_moves[self.track_positions.index(position + move.vector)].opposite]
+            back_on_track_moves = [move for move in moves if position + move.vector in self.track_indices and move
+                                   != self.track_moves[self.track_indices[position + move.vector]].opposite]
 
             if len(back_on_track_moves) > 0:
                 move = random.choice(back_on_track_moves)
                 self.track_error = False
-                self.track_index = self.track_positions.index(position + move.vector)
+                self.track_index = self.track_indices[position + move.vector]
             else:
                 move = random.choice(list(moves))
                 self.track_error = True
@@ -455,42 +496,46 @@ class TrackGhostAgent(GhostAgent):
         # Algorithm from original Berkeley course
         track_moves = []
         track_positions = []
+        track_indices = {}  # the first index of each position on the track
         start_position = gstate.agents[self.id]
+        start_x, start_y = start_position
 
         position = start_position
         last_move = util.Move.stop
         while position != start_position or len(track_positions) == 0:
             moves = gstate.legal_moves_vector(position) - {util.Move.stop}
+            neighbours = {move: position + move.vector for move in moves}  # where each of the moves leads
             index = len(track_positions)
             if len(moves) > 1:  # prevent turning back
                 moves = moves - {last_move.opposite}
             if len(moves) > 1 and index < 2*self.track_length:
-                new_moves = [move for move in moves if position + move.vector not in track_positions]
+                new_moves = [move for move in moves if neighbours[move] not in track_indices]
                 if len(new_moves) > 0:  # avoid returning to a previous point on our track unless we need to return
                     moves = new_moves
             if len(moves) > 1 and self.track_length/2 < index < 4*self.track_length and position == track_positions[1]:
-                new_moves = [move for move in moves if position + move.vector != start_position]
+                new_moves = [move for move in moves if neighbours[move] != start_position]
                 if len(new_moves) > 0:  # avoid going back to step 1 without going back to the start afterwards.
                     moves = new_moves   # this pushes for "rounder" trajectory endings, if possible
 
             if len(moves) > 1:  # bias away from start in first half, towards start afterwards
-                dist = util.manhattan(start_position, position)
-                new_dists = [util.manhattan(start_position, position + move.vector) for move in moves]
+                dist = abs(position.x - start_x) + abs(position.y - start_y)
+                new_dists = [abs(neighbours[move].x - start_x) + abs(neighbours[move].y - start_y) for move in moves]
                 if index < self.track_length / 2:
                     new_moves = [move for move, new_dist in zip(moves, new_dists) if new_dist >= dist]
                 elif index < 4*self.track_length:
                     new_moves = [move for move, new_dist in zip(moves, new_dists) if new_dist <= dist]
                 else:  # to prevent getting stuck, we start forcing it to go back asap
-                    new_moves = [(move, track_positions.index(position + move.vector)) for move in moves
-                                 if position + move.vector in track_positions]
+                    new_moves = [(move, track_indices[neighbours[move]]) for move in moves
+                                 if neighbours[move] in track_indices]
                     if len(new_moves) > 0:
                         new_moves = [min(new_moves, key=lambda x: x[1])[0]]
                 if len(new_moves) > 0:
                     moves = new_moves
 
             last_move = random.choice(list(moves))
+            track_indices.setdefault(position, len(track_positions))
             track_positions.append(position)
             track_moves.append(last_move)
-            position = position + last_move.vector
+            position = neighbours[last_move]
 
         return track_moves, track_positions
@@ -2,17 +2,41 @@
 This file contains code associated with representing an Array: a 2D grid of values.
 """
 
+import collections
 import functools
 import itertools
 import operator
-from typing import Dict, Generic, List, Tuple, TypeVar, Union
+import random
+from typing import Any, Dict, Generic, List, Tuple, TypeVar, Union
 
-from pacman.tech_util import flatten_2d, map_2d
 from pacman.util import Vector
 
 # an Array can contain values of variable type
 ArrayType = TypeVar('ArrayType')
 
+# random bits for every (x, y, value) combination, the hash of an Array is the XOR of those of its cells (Zobrist hashing)
+_zobrist_random = random.Random(0)
+_zobrist_bits = collections.defaultdict(lambda: _zobrist_random.getrandbits(64))
+
+
+@functools.lru_cache(maxsize=None)
+def _shape_coords(shape: Tuple[int, int]) -> Tuple[Vector, ...]:
+    """
+    All coordinates within an Array of the given shape, ordered by x and then y.
+    These are created only once for every shape, since all Arrays of a game share their shape.
+    """
+    return tuple(map(lambda t: Vector(*t), itertools.product(*map(range, shape))))
+
+
+def _format_columns(columns: List[List[Any]]) -> str:
+    """
+    Format the columns of an Array as lines of centered cells, converting every cell to a string only once.
+    """
+    strings = [list(map(str, column)) for column in columns]
+    max_len = max(map(len, itertools.chain.from_iterable(strings)))
+    space_sep = 1
+    return '\n'.join((' ' * space_sep).join(cell.center(max_len) for cell in column) for column in strings)
+
 
 class Array(Generic[ArrayType]):
     """
@@ -27,6 +51,17 @@ class Array(Generic[ArrayType]):
         self._array: List[List[ArrayType]] = [column.copy() for column in lst]
         self._cache_indicate: Dict[ArrayType, IndicatorArray] = {}
         self._cache_list: Dict[ArrayType, List[Vector]] = {}
+        self._hash = None  # computed when first needed, then updated with every assignment
+
+    @classmethod
+    def full(cls, shape: Tuple[int, int], value: ArrayType) -> 'Array[ArrayType]':
+        """
+        Create an Array of the given shape, in which every cell contains the given value.
+        The columns are built only once, where passing them to the constructor would copy them again.
+        """
+        full = cls([])
+        full._array = [[value] * shape[1] for _ in range(shape[0])]
+        return full
 
     def indicate(self, value: ArrayType) -> 'IndicatorArray':
         """
@@ -44,11 +79,10 @@ class Array(Generic[ArrayType]):
         the value is equal to the given value.
         """
         if value not in self._cache_list:
-            result = []
-            for x, y in itertools.product(*map(range, self.shape)):
-                if self._array[x][y] == value:
-                    result.append(Vector(x, y))
-            self._cache_list[value] = result
+            # select the cached coordinates of all cells equal to the value, without a loop in Python
+            cells = itertools.chain.from_iterable(self._array)
+            matches = map(operator.eq, cells, itertools.repeat(value))
+            self._cache_list[value] = list(itertools.compress(_shape_coords(self.shape), matches))
         return self._cache_list[value]
 
     def contains(self, vector: Tuple) -> bool:
@@ -72,7 +106,7 @@ class Array(Generic[ArrayType]):
         """
         A list of all coordinates that are within the Array.
         """
-        return list(map(lambda t: Vector(*t), itertools.product(*map(range, self.shape))))
+        return list(_shape_coords(self.shape))
 
     @property
     def transpose(self) -> 'Array[ArrayType]':
@@ -99,7 +133,9 @@ class Array(Generic[ArrayType]):
         """
         Create a copy of the array.
         """
-        return Array([column.copy() for column in self._array])
+        copy = Array(self._array)  # the constructor already copies each column
+        copy._hash = self._hash
+        return copy
 
     def __len__(self) -> int:
         return len(self._array)
@@ -107,8 +143,8 @@ class Array(Generic[ArrayType]):
     def __getitem__(self, item) -> Union[ArrayType, None]:
         if not isinstance(item, tuple) or not len(item) == 2:
             raise ValueError('can only index Array by 2-tuple (e.g. array[x,y])')
-        if self.contains(item):
-            x, y = item
+        x, y = item
+        if 0 <= x < len(self._array) and 0 <= y < len(self._array[0]):  # `contains`, inlined for speed
             return self._array[x][y]
         return None
 
@@ -119,18 +155,12 @@ class Array(Generic[ArrayType]):
         self._cache_indicate.clear()
         self._cache_list.clear()
         x, y = key
+        if self._hash is not None:  # swap the bits of the old value of the cell for those of the new value
+            self._hash ^= _zobrist_bits[x, y, self._array[x][y]] ^ _zobrist_bits[x, y, value]
         self._array[x][y] = value
 
     def __repr__(self) -> str:
-        max_len = max(map(len, map(str, flatten_2d(self._array))))
-        space_sep = 1
-        columns = []
-        for column in self._array:
-            cells = []
-            for cell in column:
-                cells.append(str(cell).center(max_len))
-            columns.append((' ' * space_sep).join(cells))
-        return '\n'.join(columns)
+        return _format_columns(self._array)
 
     def __bool__(self) -> bool:
         return any(map(any, self._array))
@@ -145,8 +175,10 @@ class Array(Generic[ArrayType]):
         return not self == other
 
     def __hash__(self) -> int:
-        column_hashes = map(hash, map(tuple, self._array))
-        return functools.reduce(operator.xor, column_hashes)
+        if self._hash is None:
+            cells = ((x, y, cell) for x, column in enumerate(self._array) for y, cell in enumerate(column))
+            self._hash = functools.reduce(operator.xor, map(_zobrist_bits.__getitem__, cells), 0)
+        return self._hash
 
 
 class IndicatorArray(Array[bool]):
@@ -158,7 +190,11 @@ class IndicatorArray(Array[bool]):
     def __init__(self, lst: List[List[ArrayType]], value: ArrayType):
         self._lst = lst
         self._value = value
-        super().__init__(self._full_indicators())
+        # the indicators are freshly built, so they need not be copied again as Array.__init__ would
+        self._array: List[List[bool]] = self._full_indicators()
+        self._cache_indicate: Dict[bool, IndicatorArray] = {}
+        self._cache_list: Dict[bool, List[Vector]] = {}
+        self._hash = None
 
     def list(self, value: bool = None) -> List[Vector]:
         """
@@ -198,10 +234,11 @@ class IndicatorArray(Array[bool]):
         return IndicatorArray([column.copy() for column in self._lst], self._value)
 
     def _full_indicators(self) -> List[List[bool]]:
-        return map_2d(lambda v: v == self._value, self._lst)
+        value = self._value  # comparing inline is cheaper than calling a function for every cell
+        return [[cell == value for cell in column] for column in self._lst]
 
     def __len__(self) -> int:
-        return len(self.list())
+        return sum(map(sum, self._array))  # counts the indicators without listing their locations
 
     def __getitem__(self, item) -> bool:
         return super().__getitem__(item)
@@ -210,19 +247,10 @@ class IndicatorArray(Array[bool]):
         raise ValueError('cannot assign to readonly indicator array')
 
     def __repr__(self) -> str:
-        indicators = self._full_indicators()
-        max_len = max(map(len, map(str, flatten_2d(indicators))))
-        space_sep = 1
-        columns = []
-        for column in indicators:
-            cells = []
-            for cell in column:
-                cells.append(str(cell).center(max_len))
-            columns.append((' ' * space_sep).join(cells))
-        return '\n'.join(columns)
+        return _format_columns(self._array)  # the indicators were already built by the constructor
 
     def __bool__(self) -> bool:
-        return bool(self.list())
+        return any(map(any, self._array))  # stops at the first indicator, without listing their locations
 
     def __eq__(self, other) -> bool:
         if isinstance(other, self.__class__):
@@ -234,4 +262,4 @@ class IndicatorArray(Array[bool]):
         return not self == other
 
     def __hash__(self) -> int:
-        return hash(self._value) ^ hash(self._lst)
+        return hash((self._value, tuple(map(tuple, self._lst))))
@@ -3,12 +3,12 @@ This file contains classes for creating different kinds of displays for the Pacm
 """
 
 import abc
-import itertools
+import functools
 import math
 import numbers
 import sys
 import tkinter
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from . import array, gamestate, tech_util, util
 
@@ -24,6 +24,7 @@ class Display(abc.ABC):
     def initialise(self, gstate: gamestate.Gamestate, cell_values: array.Array[numbers.Number]):
         """
         Pass initialisation data to the display, including the cell values that are constant throughout the game.
+        The gamestate is the game's own, so it must only be read.
         """
         pass
 
@@ -38,6 +39,7 @@ class Display(abc.ABC):
     def show(self, gstate: gamestate.Gamestate):
         """
         Display the given gamestate.
+        The gamestate is the game's own, so it must only be read.
         """
         pass
 
@@ -105,7 +107,6 @@ class GraphicalDisplay(Display):
     """
 
     WINDOW_TITLE = 'Pacman'
-    TILE_SIZE = property(lambda self: 30 * self.scale)  # the size of each grid tile
     INFO_PANE_HEIGHT = 1.17  # the height of the ścore' pane below the game
 
     BACKGROUND_COLOR = 'black'
@@ -129,6 +130,7 @@ class GraphicalDisplay(Display):
     FONT_SIZE = 0.8
 
     NON_STATIC_TAG = 'non-static'  # used for marking which elements need to be redrawn with each move
+    GHOST_TAG = 'ghost'  # used for marking the elements of ghosts, which are moved rather than redrawn
 
     # list containing vectors pointing towards the four unit corners, used in graphisc calculations
     QUADRANTS = [util.Vector(-1, -1), util.Vector(-1, 1), util.Vector(1, 1), util.Vector(1, -1)]
@@ -145,14 +147,25 @@ class GraphicalDisplay(Display):
                    util.Vector(-0.75, 0.75),
                    util.Vector(-0.5, 0.3),
                    util.Vector(-0.25, 0.75)]
+    GHOST_EYES = [util.Vector(-0.3, -0.3), util.Vector(0.3, -0.3)]  # the centers of a ghost's eyes
 
     def __init__(self, scale: numbers.Number):
         super().__init__(scale)
+        self.TILE_SIZE = 30 * scale  # the size of each grid tile, a plain attribute since it is used for every shape
+        # the corners of the ghost shape relative to the center of its tile, scaled once instead of every frame
+        self._ghost_offsets = [(coord.x * self.GHOST_SIZE, coord.y * self.GHOST_SIZE) for coord in self.GHOST_SHAPE]
         # declaration of some variables to satisfy type checker
         self._window: tkinter.Tk = None
         self.canvas: tkinter.Canvas = None
         self.mapshape: util.Vector = None
+        self._flip_y: int = None  # the highest y coordinate on the map, used for flipping locations
         self._current_keypress = None
+        self._dot_items: Dict[util.Vector, int] = {}  # canvas items of the dots that are drawn, by tile
+        self._pellet_items: Dict[util.Vector, int] = {}  # canvas items of the pellets that are drawn, by tile
+        self._ghost_items: Dict[int, List[int]] = {}  # canvas items of the ghosts that are drawn, by ghost index
+        self._score_item: int = None  # canvas item of the score text, and the score it shows
+        self._score: int = None
+        self._wall_shapes = {}  # the lines and arcs making up the walls, by the wall tiles of each layout drawn
 
     def initialise(self, gstate: gamestate.Gamestate, cell_values: array.Array[numbers.Number]):
         """
@@ -160,6 +173,7 @@ class GraphicalDisplay(Display):
         """
         # calculate window size
         self.mapshape = gstate.shape
+        self._flip_y = self.mapshape.y - 1
         width, height = self.mapshape.x * self.TILE_SIZE, (self.mapshape.y + self.INFO_PANE_HEIGHT) * self.TILE_SIZE
 
         # create window
@@ -177,6 +191,11 @@ class GraphicalDisplay(Display):
         self.canvas = tkinter.Canvas(self._window, width=width, height=height, highlightthickness=0)
         self.canvas.pack()
         self.canvas.configure(background=self.BACKGROUND_COLOR)
+        self._dot_items = {}
+        self._pellet_items = {}
+        self._ghost_items = {}
+        self._score_item = None
+        self._score = None
 
         # draw static graphics (walls and cell values)
         self.draw_walls(gstate.walls.mirror_ver)
@@ -194,21 +213,35 @@ class GraphicalDisplay(Display):
         """
         Display the given gamestate.
         """
-        self.canvas.delete(self.NON_STATIC_TAG)  # erase non-static graphics from previous turn
-        self.draw_dots(gstate.dots.mirror_ver, self.DOT_RADIUS, self.DOT_COLOR)  # draw dots
-        self.draw_dots(gstate.pellets.mirror_ver, self.PELLET_RADIUS, self.PELLET_COLOR)  # draw pellets
+        self._canvas_call('delete', self.NON_STATIC_TAG)  # erase non-static graphics from previous turn
+        # update dots and pellets, which stay on the canvas until they are eaten
+        self.draw_dots(gstate.dots, self.DOT_RADIUS, self.DOT_COLOR, self._dot_items)
+        self.draw_dots(gstate.pellets, self.PELLET_RADIUS, self.PELLET_COLOR, self._pellet_items)
         # draw pacman
         if gstate.pacman:
             self.draw_pacman(self.flipud(gstate.pacman), gstate.facings[gstate.PACMAN_ID])
-        # draw each ghost
-        for ghost, timer, facing, color in zip(gstate.ghosts, gstate.timers, gstate.facings[1:], self.GHOST_COLORS):
+        # draw each ghost, moving its items from the previous turn if there are any
+        ghosts = zip(gstate.ghosts, gstate.timers, gstate.facings[1:], self.GHOST_COLORS)
+        for index, (ghost, timer, facing, color) in enumerate(ghosts):
             if ghost:
-                self.draw_ghost(self.flipud(ghost), timer, facing, color)
+                self.draw_ghost(self.flipud(ghost), timer, facing, color, self._ghost_items.setdefault(index, []))
+            elif index in self._ghost_items:
+                for item in self._ghost_items.pop(index):
+                    self._canvas_call('delete', item)
+        self._canvas_call('raise', self.GHOST_TAG)  # keep the ghosts above the newly drawn pacman, as before
         self.draw_score(gstate.score)  # draw score text
         # propagate changes to screen
         self.canvas.update_idletasks()
         self.canvas.update()
 
+    def _canvas_call(self, *args):
+        """
+        Call a command of the canvas directly, for the drawing done every turn.
+        This skips the argument conversion and result parsing of tkinter's wrapper methods, such as
+        `self.canvas.coords(item, x0, y0, x1, y1)`, which take more time than the command itself.
+        """
+        return self.canvas.tk.call(self.canvas._w, *args)
+
     def _key_press(self, event):
         """
         Called when the user presses a key.
@@ -229,19 +262,33 @@ class GraphicalDisplay(Display):
         Flip a location in the y direction.
         Used because the game's origin is bottom left while the screen's origin is top right.
         """
-        return util.Vector(vector.x, self.mapshape.y - vector.y - 1)
+        x, y = vector
+        return util.Vector(x, self._flip_y - y)
 
     def draw_walls(self, walls: array.IndicatorArray):
         """
         Draw the walls of the layout.
-        """
-        for tile, quadrant in itertools.product(walls.coords, self.QUADRANTS):
-            if walls[tile]:
-                self._draw_wall_quadrant(walls, tile, quadrant)
+        The lines and arcs that make up the walls are only computed once for each layout.
+        """
+        wall_tiles = tuple(walls.list())
+        if wall_tiles not in self._wall_shapes:
+            lines, arcs = [], []
+            for tile in wall_tiles:
+                for quadrant_index, quadrant in enumerate(self.QUADRANTS):
+                    self._wall_quadrant(walls, tile, quadrant_index, quadrant, lines, arcs)
+            self._wall_shapes[wall_tiles] = lines, arcs
+
+        lines, arcs = self._wall_shapes[wall_tiles]
+        for line_start, line_end in lines:
+            self._draw_wall_line(line_start, line_end)
+        for point0, point1, start in arcs:
+            self._draw_wall_arc(point0, point1, start)
 
-    def _draw_wall_quadrant(self, walls: array.IndicatorArray, tile: util.Vector, quadrant: util.Vector):
+    def _wall_quadrant(self, walls: array.IndicatorArray, tile: util.Vector, quadrant_index: int,
+                       quadrant: util.Vector, lines: list, arcs: list):
         """
-        Draw a single wall quadrant. This is a quarter of a tile.
+        Compute the lines and arcs of a single wall quadrant, which is a quarter of a tile.
+        Lines are added to `lines` as (start, end) and arcs to `arcs` as (point0, point1, start angle).
         """
         tile_center = self.TILE_SIZE * (tile + 0.5)
         bases = [util.Vector(quadrant.x, 0), util.Vector(0, quadrant.y)]
@@ -253,34 +300,35 @@ class GraphicalDisplay(Display):
         if all(neighbor_walls) and diagonal_wall:
             return
 
-        self._draw_wall_quadrant_center(bases, neighbor_walls, quadrant, tile_center)
-        self._draw_wall_quadrant_sides(bases, neighbor_walls, tile_center)
+        self._wall_quadrant_center(bases, neighbor_walls, quadrant_index, quadrant, tile_center, lines, arcs)
+        self._wall_quadrant_sides(bases, neighbor_walls, tile_center, lines)
 
-    def _draw_wall_quadrant_center(self, bases: List[util.Vector], neighbor_walls: List[bool], quadrant: util.Vector,
-                                   tile_center: util.Vector):
+    def _wall_quadrant_center(self, bases: List[util.Vector], neighbor_walls: List[bool], quadrant_index: int,
+                              quadrant: util.Vector, tile_center: util.Vector, lines: list, arcs: list):
         """
-        Draw the walls on the part of a tile quadrant that is at the center of the tile.
+        Compute the walls on the part of a tile quadrant that is at the center of the tile.
         """
         wall_size = self.WALL_RADIUS * self.TILE_SIZE
         if all(neighbor_walls):  # walls on both sides of the quadrant
             box_start = tile_center + wall_size * quadrant
             box_end = tile_center + 3 * wall_size * quadrant
-            start = (270 + self.QUADRANTS.index(quadrant) * 90) % 360
-            self._draw_wall_arc(box_start, box_end, start)
+            start = (270 + quadrant_index * 90) % 360
+            arcs.append((box_start, box_end, start))
         elif any(neighbor_walls):  # wall on one side of the quadrant
             base0, base1 = (bases, reversed(bases))[neighbor_walls.index(True)]
             line_start = tile_center + 2 * wall_size * base0 + wall_size * base1
             line_end = tile_center + wall_size * base1
-            self._draw_wall_line(line_start, line_end)
+            lines.append((line_start, line_end))
         else:  # wall on neither of the sides of the quadrant
             box_start = tile_center - wall_size * quadrant
             box_end = tile_center + wall_size * quadrant
-            start = 90 + self.QUADRANTS.index(quadrant) * 90
-            self._draw_wall_arc(box_start, box_end, start)
+            start = 90 + quadrant_index * 90
+            arcs.append((box_start, box_end, start))
 
-    def _draw_wall_quadrant_sides(self, bases: List[util.Vector], neighbor_walls: List[bool], tile_center: util.Vector):
+    def _wall_quadrant_sides(self, bases: List[util.Vector], neighbor_walls: List[bool], tile_center: util.Vector,
+                             lines: list):
         """
-        Draw the walls on the part of a tile quadrant that are at the sides.
+        Compute the walls on the part of a tile quadrant that are at the sides.
         """
         wall_size = self.WALL_RADIUS * self.TILE_SIZE
         # draw each side
@@ -288,7 +336,7 @@ class GraphicalDisplay(Display):
             if neighbor_wall:
                 line_start = tile_center + 2 * wall_size * base0 + wall_size * base1
                 line_end = tile_center + 0.5 * self.TILE_SIZE * base0 + wall_size * base1
-                self._draw_wall_line(line_start, line_end)
+                lines.append((line_start, line_end))
 
     def _draw_wall_line(self, line_start: util.Vector, line_end: util.Vector):
         """
@@ -314,70 +362,111 @@ class GraphicalDisplay(Display):
         cell_values = {vector: values[vector] for vector in values.coords if values[vector] is not None}
         max_value = max(cell_values.values()) if cell_values else None
         if max_value != 0:
-            for cell, value in cell_values.items():
-                corners = [self.TILE_SIZE * (cell + 0.5 + quadrant * self.CELL_SIZE * 0.5) for quadrant in
-                           self.QUADRANTS]  # define the squares that will be drawn
-                color = self.color((1 - value / max_value) * 0.5 + 0.25, 0.25, 0.25)
-                self.canvas.create_polygon(*tech_util.flatten_2d(corners), fill=color)
-
-    def draw_dots(self, dots: array.IndicatorArray, radius: float, color: str):
+            # the offsets of the corners of the squares that will be drawn, computed with plain numbers for speed
+            tile_size = self.TILE_SIZE
+            offsets = [(0.5 + quad_x * self.CELL_SIZE * 0.5, 0.5 + quad_y * self.CELL_SIZE * 0.5)
+                       for quad_x, quad_y in self.QUADRANTS]
+            colors = {}  # color strings by the red byte that `color` would use, since many cells share a shade
+            for (x, y), value in cell_values.items():
+                corners = [coord for offset_x, offset_y in offsets
+                           for coord in (tile_size * (x + offset_x), tile_size * (y + offset_y))]
+                red = (1 - value / max_value) * 0.5 + 0.25
+                red_byte = int(red * 255)
+                if red_byte not in colors:
+                    colors[red_byte] = self.color(red, 0.25, 0.25)
+                self.canvas.create_polygon(*corners, fill=colors[red_byte])
+
+    def draw_dots(self, dots: array.IndicatorArray, radius: float, color: str, items: Dict[util.Vector, int]):
         """
         Draw dots of a certain size based on an indicator array.
-        """
-        for dot in dots.list():
-            box_start = (dot + 0.5 - radius) * self.TILE_SIZE
-            box_end = (dot + 0.5 + radius) * self.TILE_SIZE
-            self.canvas.create_oval(*tuple(box_start), *tuple(box_end - 1), outline=color, fill=color,
-                                    tag=self.NON_STATIC_TAG)
+        The given dictionary holds the canvas items of the dots drawn before, by (unflipped) tile,
+        so that only the dots that appeared or disappeared since then are drawn or erased.
+        Like the agents, new dots are flipped onto the screen, which is cheaper than mirroring the array.
+        """
+        tiles = set(dots.list())
+        for dot in items.keys() - tiles:  # erase eaten dots
+            self._canvas_call('delete', items.pop(dot))
+        tile_size = self.TILE_SIZE
+        for dot in tiles - items.keys():  # draw new dots, computing their boxes with plain numbers for speed
+            x, y = self.flipud(dot)
+            items[dot] = self.canvas.create_oval((x + 0.5 - radius) * tile_size, (y + 0.5 - radius) * tile_size,
+                                                 (x + 0.5 + radius) * tile_size - 1, (y + 0.5 + radius) * tile_size - 1,
+                                                 outline=color, fill=color)
 
     def draw_pacman(self, pacpos: util.Vector, facing: util.Move):
         """
         Draw Pacman onto the grid.
         """
-        box_start = (pacpos + 0.5 - self.PACMAN_RADIUS) * self.TILE_SIZE
-        box_end = (pacpos + 0.5 + self.PACMAN_RADIUS) * self.TILE_SIZE
+        tile_size = self.TILE_SIZE
+        box_start = (pacpos + 0.5 - self.PACMAN_RADIUS) * tile_size
+        box_end = (pacpos + 0.5 + self.PACMAN_RADIUS) * tile_size
         mouth_angle = 75 + 40 * math.sin(math.pi * sum(pacpos))
         mouth_edge = facing.degrees + mouth_angle / 2
-        self.canvas.create_arc(*tuple(box_start), *tuple(box_end - 1), outline=self.PACMAN_COLOR,
-                               fill=self.PACMAN_COLOR, start=mouth_edge, extent=360 - mouth_angle,
-                               tag=self.NON_STATIC_TAG)
+        self._canvas_call('create', 'arc', *box_start, *(box_end - 1), '-outline', self.PACMAN_COLOR,
+                          '-fill', self.PACMAN_COLOR, '-start', mouth_edge, '-extent', 360 - mouth_angle,
+                          '-tags', self.NON_STATIC_TAG)
 
-    def draw_ghost(self, ghost: util.Vector, timer: int, facing: util.Move, color: Tuple[float, float, float]):
+    def draw_ghost(self, ghost: util.Vector, timer: int, facing: util.Move, color: Tuple[float, float, float],
+                   items: List[int] = None):
         """
         Draw a ghost onto the grid.
-        """
-        shape_coords = [(ghost + 0.5 + coord * self.GHOST_SIZE) * self.TILE_SIZE for coord in self.GHOST_SHAPE]
+        If a list is given, the ghost's canvas items are kept in it, and drawing the ghost
+        with the same list again moves those items instead of creating new ones.
+        """
+        tile_size = self.TILE_SIZE
+        ghost_size = self.GHOST_SIZE
+        # flat list of coordinates, since unlike creating items, moving them does not accept points
+        center_x, center_y = ghost + 0.5
+        shape_coords = [value for offset_x, offset_y in self._ghost_offsets
+                        for value in ((center_x + offset_x) * tile_size, (center_y + offset_y) * tile_size)]
         if timer:
             color = self.SCARED_COLOR
-        self.canvas.create_polygon(*tech_util.flatten_2d(shape_coords), fill=self.color(*color), smooth=True,
-                                   tag=self.NON_STATIC_TAG)
-        ghost_center = (ghost + 0.5) * self.TILE_SIZE
-        sides = [util.Vector(-0.3, 0), util.Vector(0.3, 0)]
-        height = util.Vector(0, -0.3)
-        eyes = [side + height for side in sides]
+        ghost_center = (ghost + 0.5) * tile_size
         turning = 0.2 * facing.vector * util.Vector(1, -1)
-        for eye in eyes:
+        eye_boxes = []  # the outer part and pupil of each eye
+        for eye in self.GHOST_EYES:
             for turn_mult, size, part_color in zip([0.7, 1], [0.2, 0.1],
                                                    [self.GHOST_EYE_COLOR, self.GHOST_PUPIL_COLOR]):
-                box_start = ghost_center + (eye + turning * turn_mult - size) * self.TILE_SIZE * self.GHOST_SIZE
-                box_end = ghost_center + (eye + turning * turn_mult + size) * self.TILE_SIZE * self.GHOST_SIZE
-                self.canvas.create_oval(*tuple(box_start), *tuple(box_end), fill=part_color, outline=part_color,
-                                        tag=self.NON_STATIC_TAG)
+                box_start = ghost_center + (eye + turning * turn_mult - size) * tile_size * ghost_size
+                box_end = ghost_center + (eye + turning * turn_mult + size) * tile_size * ghost_size
+                eye_boxes.append((*box_start, *box_end, part_color))
+
+        if items:  # move the existing items
+            self._canvas_call('coords', items[0], *shape_coords)
+            self._canvas_call('itemconfigure', items[0], '-fill', self.color(*color))
+            for item, (x0, y0, x1, y1, _) in zip(items[1:], eye_boxes):
+                self._canvas_call('coords', item, x0, y0, x1, y1)
+            return
+
+        tag = self.NON_STATIC_TAG if items is None else self.GHOST_TAG
+        new_items = [self.canvas.create_polygon(*shape_coords, fill=self.color(*color), smooth=True, tag=tag)]
+        for x0, y0, x1, y1, part_color in eye_boxes:
+            new_items.append(self.canvas.create_oval(x0, y0, x1, y1, fill=part_color, outline=part_color, tag=tag))
+        if items is not None:
+            items.extend(new_items)
 
     def draw_score(self, score: int):
         """
         Draw the score text onto the info pane.
+        The text item stays on the canvas, and its text is only replaced when the score changes.
         """
+        if score == self._score:
+            return
+        self._score = score
         text = f'SCORE: {score}'
+        if self._score_item is not None:
+            self._canvas_call('itemconfigure', self._score_item, '-text', text)
+            return
         font = ('Helvetica', str(int(round(self.FONT_SIZE * self.TILE_SIZE))), 'bold')
-        self.canvas.create_text(int(round(self.TILE_SIZE / 3)), self.mapshape.y * self.TILE_SIZE, text=text,
-                                fill=self.SCORE_TEXT_COLOR,
-                                anchor='nw', font=font, tag=self.NON_STATIC_TAG)
+        self._score_item = self.canvas.create_text(int(round(self.TILE_SIZE / 3)), self.mapshape.y * self.TILE_SIZE,
+                                                   text=text, fill=self.SCORE_TEXT_COLOR, anchor='nw', font=font)
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def color(r, g, b):
         """
         Convert RGB values into a color string (used by tkinter).
+        The strings are remembered, since the same few colors (such as those of the ghosts) are used every frame.
         """
         return '#{:02x}{:02x}{:02x}'.format(int(r * 255), int(g * 255), int(b * 255))
 
@@ -5,7 +5,8 @@ rather than heuristics like the Manhattan distance.
 """
 
 import collections
-import queue
+from typing import Dict
+
 from . import util
 
 
@@ -18,7 +19,9 @@ class Distancer:
 
     def __init__(self, gstate):
         self.walls = gstate.walls
-        self.distances = collections.defaultdict(lambda: float('inf'))
+        # the distances from every position to each position reachable from it, grouped by the first position
+        # nesting plain dictionaries is both smaller and faster to look up than keying one by pairs of positions
+        self.distances_from: Dict[util.Vector, Dict[util.Vector, int]] = {}
 
     def precompute_distances(self):
         """
@@ -27,22 +30,27 @@ class Distancer:
         """
         all_points = self.walls.list(False)
 
+        # the open neighbours of every position, found once instead of during each of the searches below
+        neighbours = {}
+        for position in all_points:
+            new_positions = (position + move.vector for move in util.Move.no_stop)
+            neighbours[position] = [new_position for new_position in new_positions if not self.walls[new_position]]
+
         for starting_position in all_points:
-            frontier = queue.PriorityQueue(len(all_points))
-            frontier.put((0, starting_position))
-            visited = set()
-
-            while not frontier.empty():
-                dist, position = frontier.get()
-                if position in visited:
-                    continue
-                self.distances[starting_position, position] = dist
-                visited.add(position)
-
-                for move in util.Move.no_stop:
-                    new_position = position + move.vector
-                    if not self.walls[new_position] and new_position not in visited:
-                        frontier.put((dist+1, new_position))
+            # every step costs 1, so a breadth-first search reaches each position first along a shortest path
+            frontier = collections.deque([starting_position])
+            distances = {starting_position: 0}  # also serves as the set of visited positions
+
+            while frontier:
+                position = frontier.popleft()
+                dist = distances[position] + 1
+
+                for new_position in neighbours[position]:
+                    if new_position not in distances:
+                        distances[new_position] = dist
+                        frontier.append(new_position)
+
+            self.distances_from[starting_position] = distances
 
     def get_distance(self, pos1, pos2):
         """
@@ -50,4 +58,7 @@ class Distancer:
         If there is no path between the points (e.g., one is a wall)
         this will return infinity.
         """
-        return self.distances[pos1, pos2]
+        try:
+            return self.distances_from[pos1][pos2]
+        except KeyError:
+            return float('inf')
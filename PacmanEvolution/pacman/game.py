@@ -32,20 +32,22 @@ def run_game(layout: array.Array, all_agents: List[agents.Agent], display: displ
     for index, agent in enumerate(all_agents):
         if timeouts:
             agent_prepare_timeout(agent, gstate)
-        elif index is 0:
+        elif index == 0:
             agent.prepare(gstate.copy, genome, config)
         else:  # pass the genome here?
             agent.prepare(gstate.copy)
 
     # initialise the display
     pacman: agents.PacmanAgent = all_agents[0]
-    display.initialise(gstate.copy, pacman.cell_values)
-    display.show(gstate.copy)
+    display.initialise(gstate, pacman.cell_values)  # displays only read the gamestate, so it is not copied
+    display.show(gstate)
 
     # initialise timeout warning counter
     timeout_warnings = collections.Counter()
     timeit = None
     stats = GameStats()
+    # the pause between ticks, which is skipped entirely for displays that do not want one (such as NoDisplay)
+    timedelta = display.preferred_timedelta / speed
 
     # main game loop
     while not gstate.gameover:
@@ -65,8 +67,9 @@ def run_game(layout: array.Array, all_agents: List[agents.Agent], display: displ
         
         stats.register_move(movetime)
         gstate.tick()
-        display.show(gstate.copy)
-        time.sleep(display.preferred_timedelta / speed)
+        display.show(gstate)
+        if timedelta:
+            time.sleep(timedelta)
     
     stats.register_game(gstate.score, gstate.win, timeout_warnings[0] >= MAX_WARNINGS)
 
@@ -140,4 +143,16 @@ class GameStats:
                          self.sum_times + other.sum_times,
                          self.num_wins  + other.num_wins,
                          self.timeouts  + other.timeouts)
+
+    def __iadd__(self, other):
+        # accumulate in-place, so that `+=` does not create a new GameStats for every game
+        if not isinstance(other, GameStats):
+            raise TypeError('You can only add a GameStats to another GameStats')
+        self.num_games += other.num_games
+        self.num_moves += other.num_moves
+        self.sum_score += other.sum_score
+        self.sum_times += other.sum_times
+        self.num_wins  += other.num_wins
+        self.timeouts  += other.timeouts
+        return self
         
@@ -35,11 +35,14 @@ class Gamestate:
             self.agents = arr.list(layouts.LayoutObject.pacman) + arr.list(layouts.LayoutObject.ghost)
         for x, y in self.active_agents:  # clear floor beneath agents
             self._statics[x, y] = layouts.LayoutObject.empty
-        self.starts = self.agents.copy()  # remember start locations
+        self.starts = self.agents.copy()  # remember start locations, shared with copies so it must not be modified
         self.facings = [util.Move.stop] * len(self.agents)  # the way that each agent is facing
         self._timers = [0] * len(self.agents)  # all agents' scared timers (Pacman's is not used)
         self.score = 0  # current score
         self._tick = 0  # current turn
+        self._dot_list = None  # locations of the remaining dots, computed when first needed
+        self._walls = None  # indicator of the walls, computed when first needed and shared with copies
+        self._legal_moves = {}  # legal moves by location, shared with copies since the walls never change
 
     @property
     def pacman(self) -> util.Vector:
@@ -72,9 +75,12 @@ class Gamestate:
     @property
     def walls(self) -> array.IndicatorArray:
         """
-        Array indicating layout of walls
+        Array indicating layout of walls. Since the walls never change, this is built only once
+        for a gamestate and its copies, where the indicators of the dots and pellets are rebuilt for every copy.
         """
-        return self._statics.indicate(layouts.LayoutObject.wall)
+        if self._walls is None:
+            self._walls = self._statics.indicate(layouts.LayoutObject.wall)
+        return self._walls
 
     @property
     def dots(self) -> array.IndicatorArray:
@@ -83,6 +89,16 @@ class Gamestate:
         """
         return self._statics.indicate(layouts.LayoutObject.dot)
 
+    @property
+    def dot_list(self) -> List[util.Vector]:
+        """
+        Locations of the remaining dots. Contrary to `dots.list()`, this list is passed on to
+        copies of the gamestate and only rebuilt when Pacman eats a dot, so it must not be modified.
+        """
+        if self._dot_list is None:
+            self._dot_list = self.dots.list()
+        return self._dot_list
+
     @property
     def pellets(self) -> array.IndicatorArray:
         """
@@ -97,19 +113,32 @@ class Gamestate:
         """
         return self._statics.shape
 
+    @property
+    def key(self) -> tuple:
+        """
+        A hashable summary of the gamestate, containing everything that determines
+        the outcome of searching onwards from it (agent locations, scared timers,
+        score, and the hash of the layout with its remaining dots and pellets).
+        Used for transposition tables.
+        """
+        return tuple(self.agents), tuple(self._timers), self.score, hash(self._statics)
+
     @property
     def copy(self):
         """
         Create an independent copy of the gamestate
         """
-        copy = Gamestate(array.Array([]))
+        copy = Gamestate.__new__(Gamestate)  # every attribute is set below, so the constructor is skipped
         copy._statics = self._statics.copy()
         copy.agents = self.agents.copy()
-        copy.starts = self.starts.copy()
+        copy.starts = self.starts  # the start locations never change, so they are shared
         copy.facings = self.facings.copy()
         copy._timers = self._timers.copy()
         copy.score = self.score
         copy._tick = self._tick
+        copy._dot_list = self._dot_list
+        copy._walls = self._walls
+        copy._legal_moves = self._legal_moves
         return copy
 
     def apply_move(self, agent_id: int, move: util.Move):
@@ -137,33 +166,63 @@ class Gamestate:
         if agent_id == self.PACMAN_ID:  # if agent is Pacman, apply turn penalty
             self.score += self.SCORE_TICK_PENALTY
 
-        if self.walls[new_vector]:  # if agent moves into a wall, end the game
+        # read the destination once, instead of building indicator arrays for each of the checks below
+        cell = self._statics[new_vector]
+
+        if cell == layouts.LayoutObject.wall:  # if agent moves into a wall, end the game
             if agent_id == self.PACMAN_ID:
                 self.score += self.SCORE_DIE_PENALTY
             raise RuntimeError(f'agent {agent_id} walked into a wall at {new_vector}')
 
         if agent_id == self.PACMAN_ID:
 
-            if new_vector in self.ghosts:  # if Pacman runs into a ghost, resolve the encounter
-                ghost_id = self.ghosts.index(new_vector) + 1
+            # if Pacman runs into a ghost, resolve the encounter
+            # (Pacman is counted as well, searching the agents directly avoids building the list of ghosts)
+            if self.agents.count(new_vector) > 1:
+                ghost_id = self.agents.index(new_vector, self.PACMAN_ID + 1)
                 self._resolve_encounter(ghost_id)
 
-            if self.dots[new_vector]:  # if Pacman runs into a dot, eat it and reward score
+            if cell == layouts.LayoutObject.dot:  # if Pacman runs into a dot, eat it and score
                 self._statics[new_vector] = layouts.LayoutObject.empty
+                if self._dot_list is not None:  # the list may be shared with other gamestates, so replace it
+                    index = self._dot_list.index(new_vector)  # the dot occurs once, so slicing around it suffices
+                    self._dot_list = self._dot_list[:index] + self._dot_list[index + 1:]
                 self.score += self.SCORE_GET_DOT
-                if not self.dots.list():
+                if not self.dot_list:
                     self.score += self.SCORE_GET_ALL_DOTS
 
-            if self.pellets[new_vector]:  # if Pacman runs into a pellet, eat it, reward score, and set timers
+            elif cell == layouts.LayoutObject.pellet:  # if Pacman runs into a pellet, eat it, reward score, and set timers
                 self._statics[new_vector] = layouts.LayoutObject.empty
                 self.score += self.SCORE_GET_PELLET
-                self._timers[1:] = [self.SCARED_TIME] * len(self._timers[1:])
+                self._timers[1:] = [self.SCARED_TIME] * (len(self._timers) - 1)
 
         else:
 
             if new_vector == self.pacman:  # if a ghost runs into Pacman, resolve the encounter
                 self._resolve_encounter(agent_id)
 
+    def make_move(self, agent_id: int, move: util.Move) -> tuple:
+        """
+        Apply an agent's move in-place like `apply_move`, but also return a record of what it changed.
+        Passing the record to `unmake_move` restores the gamestate, which is cheaper than creating
+        a successor when the resulting gamestate is only inspected briefly.
+        """
+        cell = value = None
+        if agent_id == self.PACMAN_ID and self.agents[agent_id]:  # Pacman may eat whatever is at the destination
+            cell = self.agents[agent_id] + (move or util.Move.stop).vector
+            value = self._statics[cell]
+        undo = self.agents.copy(), self.facings.copy(), self._timers.copy(), self.score, self._dot_list, cell, value
+        self.apply_move(agent_id, move)
+        return undo
+
+    def unmake_move(self, undo: tuple):
+        """
+        Undo a move made by `make_move`, given the record it returned. Each record can only be used once.
+        """
+        self.agents, self.facings, self._timers, self.score, self._dot_list, cell, value = undo
+        if cell is not None and self._statics[cell] != value:  # restore the eaten dot or pellet
+            self._statics[cell] = value
+
     def _resolve_encounter(self, ghost_id: int):
         """
         Resolve an encounter between Pacman and a ghost
@@ -188,13 +247,13 @@ class Gamestate:
     def legal_moves_vector(self, vector: util.Vector):
         """
         Get all moves that are possible from a particular location (taking walls into consideration).
+        The resulting set is cached for the location, so it must not be modified.
         """
-        moves = set()
-        for move in util.Move:
-            new_vector = vector + move.vector
-            if not self.walls[new_vector]:
-                moves.add(move)
-        return moves
+        if vector not in self._legal_moves:
+            walls = self.walls
+            x, y = vector  # the walls are indexed by plain coordinates, so that no Vector is created for every move
+            self._legal_moves[vector] = {move for move in util.Move if not walls[x + move.dx, y + move.dy]}
+        return self._legal_moves[vector]
 
     def legal_moves_id(self, agent_id: int):
         """
@@ -207,7 +266,7 @@ class Gamestate:
         """
         Whether Pacman has won the game. This is the case when all dots have been eaten.
         """
-        return not self.loss and not self.dots.list()
+        return not self.loss and not self.dot_list
 
     @property
     def loss(self) -> bool:
@@ -221,7 +280,7 @@ class Gamestate:
         """
         Whether the game is over. This is the case when Pacman has won or lost the game.
         """
-        return self.win or self.loss
+        return not self.pacman or not self.dot_list  # equal to `self.win or self.loss`, but checks the loss only once
 
     def tick(self):
         """
@@ -3,7 +3,6 @@ This file contains code for representing elements of a Pacman level layout and l
 """
 
 import enum
-import itertools
 import os
 from typing import List, Optional, Tuple, Type
 
@@ -30,17 +29,19 @@ class LayoutObject(enum.Enum):
         """
         Convert a string from a layout file to a LayoutObject.
         """
-        switch = {str(obj): obj for obj in cls}
-        for i in range(3):  # recognize different ghost types
-            switch[str(i+1)] = LayoutObject.ghost
-        if symbol not in switch:
+        if symbol not in _LAYOUT_OBJECT_SYMBOLS:
             raise ValueError(f"unknown layout symbol '{symbol}'")
-        return switch[symbol]
+        return _LAYOUT_OBJECT_SYMBOLS[symbol]
 
     def __str__(self) -> str:
         return self.value
 
 
+# the LayoutObject of every symbol in a layout file, built once since it is looked up for every cell of a layout
+_LAYOUT_OBJECT_SYMBOLS = {str(obj): obj for obj in LayoutObject}
+_LAYOUT_OBJECT_SYMBOLS.update({str(i + 1): LayoutObject.ghost for i in range(3)})  # recognize different ghost types
+
+
 class GhostType(enum.Enum):
     """
     An enumeration of types representing ghost types found in a Pacman layout.
@@ -52,14 +53,7 @@ class GhostType(enum.Enum):
 
     @classmethod
     def from_symbol(cls, symbol: str) -> 'GhostType':
-        if symbol == '1':
-            return GhostType.track_ghost
-        elif symbol == '2' or symbol == 'G':
-            return GhostType.random_ghost
-        elif symbol == '3':
-            return GhostType.chasing_ghost
-        else:
-            return GhostType.no_ghost
+        return _GHOST_TYPE_SYMBOLS.get(symbol, GhostType.no_ghost)
 
     @property
     def agent(self) -> Optional[Type['Agent']]:
@@ -73,6 +67,13 @@ class GhostType(enum.Enum):
             return agents.ChasingGhostAgent
 
 
+# the GhostType of every symbol in a layout file that places a ghost
+_GHOST_TYPE_SYMBOLS = {'1': GhostType.track_ghost,
+                       '2': GhostType.random_ghost,
+                       'G': GhostType.random_ghost,
+                       '3': GhostType.chasing_ghost}
+
+
 def load_layout(filename: str) -> Tuple[array.Array, List[Tuple[GhostType, util.Vector]]]:
     """
     Given the name of a layout file, load and return the layout as an Array.
@@ -82,14 +83,16 @@ def load_layout(filename: str) -> Tuple[array.Array, List[Tuple[GhostType, util.
     with open(filepath) as f:
         symbols = [list(line.strip()) for line in f]
     objects = tech_util.map_2d(LayoutObject.from_symbol, symbols)
-    ghost_types = tech_util.map_2d(GhostType.from_symbol, symbols)
 
     ghosts = []
-    shape = len(ghost_types), len(ghost_types[0])
-    for x, y in itertools.product(*map(range, shape)):
-        if ghost_types[x][y] != GhostType.no_ghost:
-            ghost_position = util.Vector(y, shape[0] - x - 1)  # see comment below
-            ghosts.append((ghost_types[x][y], ghost_position))
+    shape = len(symbols), len(symbols[0])
+    for x, row in enumerate(symbols):
+        if _GHOST_TYPE_SYMBOLS.keys().isdisjoint(row):  # most rows hold no ghost, which is checked without a loop
+            continue
+        for y, symbol in enumerate(row):
+            if symbol in _GHOST_TYPE_SYMBOLS:  # only the few ghost symbols are converted, not every cell
+                ghost_position = util.Vector(y, shape[0] - x - 1)  # see comment below
+                ghosts.append((GhostType.from_symbol(symbol), ghost_position))
 
     # The display has its origin in the top right, but we are using
     # (1,1) as origin, so we transpose and mirror vertically.
@@ -97,4 +100,5 @@ def load_layout(filename: str) -> Tuple[array.Array, List[Tuple[GhostType, util.
     # To keep ghost order the same for the -g option, we sort
     # the ghosts based on the correct (transposed mirrored) position.
     ghosts = sorted(ghosts, key=lambda gh: gh[1])
-    return array.Array(objects).transpose.mirror_ver, ghosts
+    # transposing and mirroring at once, instead of through the intermediate Arrays of `transpose` and `mirror_ver`
+    return array.Array(list(map(list, zip(*reversed(objects))))), ghosts
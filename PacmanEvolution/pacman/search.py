@@ -18,6 +18,9 @@ StateType = TypeVar('StateType')
 # that was used to transition to it, and the cost of making this transition
 Successor = Tuple[StateType, List[util.Move], float]
 
+# every non-stop move with the components of its vector, so that walls can be checked before creating a Vector
+MOVE_DELTAS = [(move, move.vector.x, move.vector.y) for move in util.Move.no_stop]
+
 """
 Search representations
 """
@@ -42,7 +45,25 @@ class SearchRepresentation(abc.ABC, Generic[StateType]):
 
     def __init__(self, gstate: gamestate.Gamestate):
         self.expansion_count = 0
-        self.expansion_order = array.Array([[None] * gstate.shape.y for _ in range(gstate.shape.x)])
+        self.expansion_order = array.Array.full(gstate.shape, None)
+        self._neighbours = {}  # the open neighbours of every position expanded so far, see `neighbours`
+
+    def neighbours(self, position: util.Vector) -> List[Tuple[util.Vector, List[util.Move]]]:
+        """
+        The positions next to the given position that are not walls, each with the single move leading there.
+        The walls are read from the representation's own `self.walls`, which never change during a search.
+        The neighbours are found once per position, so states at the same position share the same Vector objects
+        and move lists for their successors instead of creating new ones at every expansion.
+        The move lists end up in the successors, so like those they must not be modified.
+        """
+        neighbours = self._neighbours.get(position)
+        if neighbours is None:
+            walls = self.walls
+            x, y = position
+            neighbours = [(util.Vector(x + dx, y + dy), [move]) for move, dx, dy in MOVE_DELTAS
+                          if not walls[x + dx, y + dy]]
+            self._neighbours[position] = neighbours
+        return neighbours
 
     @property
     @abc.abstractmethod
@@ -92,11 +113,12 @@ def standard_pathcost(path: List[util.Move], start: StateType, walls: array.Arra
     with the possibility to give a cost function that defines
     the cost of each move.
     """
-    vector = start
+    x, y = start  # plain coordinates, so that no Vector is created for every step
     cost = 0
     for direction in path:
-        vector += direction.vector
-        if walls[vector]:
+        x += direction.dx
+        y += direction.dy
+        if walls[x, y]:
             return float('inf')
         cost += cost_fn(direction.vector)
     return cost
@@ -141,12 +163,10 @@ class PositionSearchRepresentation(SearchRepresentation[util.Vector]):
         Get all successor states of the given state in this representation.
         """
         successors = []
-        for move in util.Move.no_stop:
-            new_vector = state + move.vector
-            if not self.walls[new_vector]:
-                cost = self.cost_fn(new_vector)
-                successor = (new_vector, [move], cost)
-                successors.append(successor)
+        for new_vector, moves in self.neighbours(state):
+            cost = self.cost_fn(new_vector)
+            successor = (new_vector, moves, cost)
+            successors.append(successor)
         return successors
 
     def pathcost(self, path: List[util.Move]) -> float:
@@ -197,12 +217,11 @@ class AllDotSearchRepresentation(SearchRepresentation[AllDotSearchState]):
         Get all successor states of the given state in this representation.
         """
         successors = []
-        for move in util.Move.no_stop:
-            new_vector = state.vector + move.vector
-            if not self.walls[new_vector]:
-                new_dots = state.dots - {new_vector}
-                successor = (AllDotSearchState(new_vector, new_dots), [move], 1)
-                successors.append(successor)
+        for new_vector, moves in self.neighbours(state.vector):
+            # the dots are immutable, so they are only replaced when the move eats one
+            new_dots = state.dots - {new_vector} if new_vector in state.dots else state.dots
+            successor = (AllDotSearchState(new_vector, new_dots), moves, 1)
+            successors.append(successor)
         return successors
 
     def pathcost(self, path: List[util.Move]) -> float:
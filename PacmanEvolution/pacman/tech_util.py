@@ -5,6 +5,7 @@ which is then used somewhere in the Pacman code.
 """
 
 import contextlib
+import itertools
 import signal
 import sys
 import time
@@ -35,7 +36,7 @@ def flatten_2d(l):
     Flatten a 1D or fully 2D list into a 1D list.
     """
     if l and isinstance(l[0], list):
-        return sum(l, [])
+        return list(itertools.chain.from_iterable(l))  # linear, where `sum(l, [])` copies the list for every row
     else:
         return l
 
@@ -46,11 +47,11 @@ class timeit(object):
     """
 
     def __enter__(self):
-        self.t = time.clock()
+        self.t = time.perf_counter()  # `time.clock` no longer exists since Python 3.8
         return self
 
     def __exit__(self, typ, value, traceback):
-        self.t = time.clock() - self.t
+        self.t = time.perf_counter() - self.t
 
 
 class TimeoutException(Exception):
@@ -67,9 +68,9 @@ def windows_timeout(seconds):
     takes longer to execute than the given amount of seconds.
     Does not terminate the function.
     """
-    t0 = time.time()
+    t0 = time.monotonic()  # unlike `time.time`, not affected by changes to the system clock
     yield
-    if time.time() - t0 > seconds:
+    if time.monotonic() - t0 > seconds:
         raise TimeoutException
 
 @contextlib.contextmanager
@@ -83,11 +84,11 @@ def linux_timeout(seconds):
         raise TimeoutException()
 
     signal.signal(signal.SIGALRM, signal_handler)
-    signal.alarm(seconds)
+    signal.setitimer(signal.ITIMER_REAL, seconds)  # unlike `signal.alarm`, allows fractions of a second
     try:
         yield
     finally:
-        signal.alarm(0)
+        signal.setitimer(signal.ITIMER_REAL, 0)
 
 if hasattr(signal, 'SIGALRM'):
     timeout = linux_timeout
@@ -5,45 +5,55 @@ code is found in tech_util.py.
 """
 
 import enum
+import heapq
+import itertools
 import math
 import numbers
-import queue
 from typing import List, NamedTuple, Tuple
 
 from pacman.tech_util import classproperty
 
 
-class PriorityFunctionQueue(queue.PriorityQueue):
+class PriorityFunctionQueue:
     """
-    A queue based on the classes in the standard library `queue` module,
+    A queue with the interface of the classes in the standard library `queue` module,
     which uses a given function to determine the priority of each given item.
-    For example:
+    Items of equal priority come out in the order they were put in. For example:
       queue = PriorityFunctionQueue(some_function)
       queue.put(an_element)
       the_element = queue.get()
+    Unlike `queue.PriorityQueue`, this is not meant to be shared between threads, so it takes no locks.
     """
 
     def __init__(self, priority_fn=lambda x: 0):
-        super().__init__()
         self.priority_fn = priority_fn
-        self.mapping = {}
-        self.next_id = 0
+        self._heap = []  # (priority, insertion number, item) tuples, kept in order by `heapq`
+        self._counter = itertools.count()
 
+    # noinspection PyUnusedLocal
     def put(self, item, *args, **kwargs):
-        priority = self.priority_fn(item)
-        self.mapping[self.next_id] = item
-        super().put((priority, self.next_id), *args, **kwargs)
-        self.next_id += 1
+        heapq.heappush(self._heap, (self.priority_fn(item), next(self._counter), item))
 
+    # noinspection PyUnusedLocal
     def get(self, *args, **kwargs):
-        _, ident = super().get(*args, **kwargs)
-        return self.mapping[ident]
+        return heapq.heappop(self._heap)[2]
+
+    def empty(self) -> bool:
+        return not self._heap
+
+    def qsize(self) -> int:
+        return len(self._heap)
+
+
+# the numbers a Vector can be combined with, where the builtin types are checked before the slower abstract class
+_SCALAR_TYPES = (int, float, numbers.Number)
 
 
 class Vector(NamedTuple('Vector', [('x', int), ('y', int)])):
     """
     A 2D vector, representing a position or movement in 2D space.
     """
+    __slots__ = ()
 
     # noinspection PyMethodParameters
     @classproperty
@@ -63,25 +73,34 @@ class Vector(NamedTuple('Vector', [('x', int), ('y', int)])):
 
     def __add__(self, other) -> 'Vector':
         if isinstance(other, Vector):
-            return Vector(self.x + other.x, self.y + other.y)
-        elif isinstance(other, numbers.Number):
-            return Vector(self.x + other, self.y + other)
+            x, y = self
+            other_x, other_y = other
+            return tuple.__new__(Vector, (x + other_x, y + other_y))  # skip the namedtuple constructor
+        elif isinstance(other, _SCALAR_TYPES):
+            x, y = self
+            return tuple.__new__(Vector, (x + other, y + other))
         else:
             return super().__add__(other)
 
     def __sub__(self, other) -> 'Vector':
         if isinstance(other, Vector):
-            return Vector(self.x - other.x, self.y - other.y)
-        elif isinstance(other, numbers.Number):
-            return Vector(self.x - other, self.y - other)
+            x, y = self
+            other_x, other_y = other
+            return tuple.__new__(Vector, (x - other_x, y - other_y))
+        elif isinstance(other, _SCALAR_TYPES):
+            x, y = self
+            return tuple.__new__(Vector, (x - other, y - other))
         else:
             return super().__sub__(other)
 
     def __mul__(self, other) -> 'Vector':
         if isinstance(other, Vector):
-            return Vector(self.x * other.x, self.y * other.y)
-        elif isinstance(other, numbers.Number):
-            return Vector(self.x * other, self.y * other)
+            x, y = self
+            other_x, other_y = other
+            return tuple.__new__(Vector, (x * other_x, y * other_y))
+        elif isinstance(other, _SCALAR_TYPES):
+            x, y = self
+            return tuple.__new__(Vector, (x * other, y * other))
         else:
             return super().__mul__(other)
 
@@ -91,7 +110,7 @@ class Vector(NamedTuple('Vector', [('x', int), ('y', int)])):
     def __truediv__(self, other: numbers.Number) -> 'Vector':
         if isinstance(other, Vector):
             return Vector(self.x / other.x, self.y / other.y)
-        elif isinstance(other, numbers.Number):
+        elif isinstance(other, _SCALAR_TYPES):
             return Vector(self.x / other, self.y / other)
         else:
             return super().__truediv__(other)
@@ -99,7 +118,7 @@ class Vector(NamedTuple('Vector', [('x', int), ('y', int)])):
     def __floordiv__(self, other) -> 'Vector':
         if isinstance(other, Vector):
             return Vector(self.x // other.x, self.y // other.y)
-        elif isinstance(other, numbers.Number):
+        elif isinstance(other, _SCALAR_TYPES):
             return Vector(self.x // other, self.y // other)
         else:
             return super().__floordiv__(other)
@@ -117,6 +136,7 @@ class Vector(NamedTuple('Vector', [('x', int), ('y', int)])):
 class Move(enum.Enum):
     """
     An enumeration of types representing standard movements in the Pacman world.
+    Opposite moves are defined in pairs, so the index of a move's opposite only differs in its lowest bit.
     """
     up = Vector(0, 1)
     down = Vector(0, -1)
@@ -124,45 +144,39 @@ class Move(enum.Enum):
     left = Vector(-1, 0)
     stop = Vector(0, 0)
 
-    @property
-    def vector(self) -> Vector:
-        """
-        The vector describing the movement.
-        """
-        return self.value
+    def __init__(self, dx: int, dy: int):
+        # plain attributes, since these are read on every step and properties (including `value`) are slower
+        self.vector: Vector = self._value_  # the vector describing the movement
+        self.dx = dx  # the components of the vector
+        self.dy = dy
 
     @property
     def opposite(self) -> 'Move':
         """
         The opposite of the given movement.
         """
-        if self == Move.stop:
-            return Move.stop
-        else:
-            return Move.by_index(self.index + 1 - 2 * (self.index % 2))
+        return _MOVE_OPPOSITES[self]
 
     @property
     def degrees(self) -> float:
         """
         The movement vector converted to degrees.
         """
-        return 180 / math.pi * math.atan2(self.vector.y, self.vector.x)
+        return _MOVE_DEGREES[self]
 
     @property
     def index(self) -> int:
         """
         The index of the movement as defined in the enumeration.
         """
-        # noinspection PyTypeChecker
-        return list(Move).index(self)
+        return _MOVE_INDICES[self]
 
     @classmethod
     def by_index(cls, i) -> 'Move':
         """
         Get a Move by index as defined in the enumeration.
         """
-        # noinspection PyTypeChecker
-        return list(cls)[i]
+        return _MOVES[i]
 
     # noinspection PyMethodParameters
     @classproperty
@@ -170,31 +184,40 @@ class Move(enum.Enum):
         """
         Get all moves except stop.
         """
-        # noinspection PyTypeChecker
-        return [move for move in cls if move != cls.stop]
+        return list(_NO_STOP_MOVES)  # a new list, so that callers may modify it
     
     def __lt__(self, other):
         """
         Comparing two Moves: is self < other true? Required to sort Moves
         """
         if isinstance(other, Move):
-            return self.value < other.value
+            return _MOVE_ORDER[self] < _MOVE_ORDER[other]  # the order of the vectors, without comparing tuples
         else:
             return NotImplemented
 
 
+# the properties of the moves, computed once since they are looked up for every move that agents consider
+# noinspection PyTypeChecker
+_MOVES: List[Move] = list(Move)
+_MOVE_INDICES = {move: index for index, move in enumerate(_MOVES)}
+_MOVE_OPPOSITES = {move: (move if move == Move.stop else _MOVES[index ^ 1]) for index, move in enumerate(_MOVES)}
+_MOVE_DEGREES = {move: 180 / math.pi * math.atan2(move.vector.y, move.vector.x) for move in _MOVES}
+_NO_STOP_MOVES = [move for move in _MOVES if move != Move.stop]
+_MOVE_ORDER = {move: rank for rank, move in enumerate(sorted(_MOVES, key=lambda move: move.vector))}
+
+
 def manhattan(vector1: Vector, vector2: Vector) -> int:
     """
     The manhattan distance between the two vectors.
     """
-    return sum(abs(vector1 - vector2))
+    return abs(vector1[0] - vector2[0]) + abs(vector1[1] - vector2[1])  # without creating intermediate Vectors
 
 
 def euclidean(vector1: Vector, vector2: Vector) -> float:
     """
     The euclidean distance between the two vectors.
     """
-    return math.sqrt(sum((vector1 - vector2) ** 2))
+    return math.dist(vector1, vector2)  # computed like `math.hypot` on the differences, in a single call
 
 
 # a (probability) distribution consists of values and associated weights
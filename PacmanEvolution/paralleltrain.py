@@ -25,6 +25,7 @@ The mode parameters depend on the chosen mode.
 """
 
 import argparse
+import multiprocessing
 import os
 import random
 import re
@@ -56,7 +57,8 @@ class Worker(object):
         self.config = config
 
     def work(self):
-        gstate, stats = run(layouts[0], pacman_agent, display, args.speed, args.ghosts, args.timeouts, genome, config)
+        gstate, stats = run(layouts[0], pacman_agent, display, args.speed, args.ghosts, args.timeouts,
+                            self.genome, self.config)
         fitness = gstate.score
 
         print(fitness)
@@ -299,8 +301,8 @@ pop = neat.Population(config)
 stats = neat.StatisticsReporter()
 pop.add_reporter(stats)
 
-# Run game and get winner
-pe = neat.ParallelEvaluator(10, eval_genomes)
+# Run game and get winner, evaluating the genomes of each generation on all cores
+pe = neat.ParallelEvaluator(multiprocessing.cpu_count(), eval_genomes)
 
 winner = pop.run(pe.evaluate)
 
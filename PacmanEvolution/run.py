@@ -23,16 +23,15 @@ The mode parameters depend on the chosen mode.
 """
 
 import argparse
+import functools
 import os
 import random
-import re
 import sys
 
 import pacman
 import ass2
 import ass3
 import ass4
-import ass5contest
 
 # the directory of the layout files
 LAYOUT_FILES_DIR = 'pacman/layout_files'
@@ -92,6 +91,10 @@ adversarial_evaluates = {'score': pacman.agents.score_evaluate,
                          'better': ass4.better_evaluate}
 
 
+# loads every layout file only once, however many runs use it (the layout files are not changed while running)
+load_layout = functools.lru_cache(maxsize=None)(pacman.layouts.load_layout)
+
+
 def run(layout_name: str, pacman_agent: pacman.agents.PacmanAgent, display: pacman.displays.Display,
         speed: float, num_ghosts: int, timeouts: bool):
     """
@@ -104,7 +107,8 @@ def run(layout_name: str, pacman_agent: pacman.agents.PacmanAgent, display: pacm
     :param timeouts: whether to make use of agent action timeouts
     :return: the final Gamestate
     """
-    layout, ghosts = pacman.layouts.load_layout(layout_name)
+    layout, ghosts = load_layout(layout_name)
+    layout = layout.copy()  # the superfluous ghosts are removed below, which must not affect the cached layout
     num_ghosts = min(num_ghosts, len(ghosts))
     for _, position in ghosts[num_ghosts:]:  # remove superfluous ghosts
         layout[position] = pacman.layouts.LayoutObject.empty
@@ -174,7 +178,7 @@ def main():
 
     # ask the user for arguments if none passed
     if len(sys.argv) == 1:
-        sys.argv.extend([x for x in re.split(r' +', input("Enter command-line arguments: ")) if x != ''])
+        sys.argv.extend(input("Enter command-line arguments: ").split())  # splitting drops empty strings itself
 
     # preparation
     args = parser.parse_args()
@@ -208,8 +212,9 @@ def main():
         agent_type = search_agents[args.agent]
         if args.heuristic:
             heuristic = search_heuristics[args.heuristic]
-            method = lambda state: search_methods[args.method](state, heuristic)
-            method.__name__ = 'astar'
+            # the method is looked up once, where a lambda would look it up for every search
+            method = functools.partial(search_methods[args.method], heuristic=heuristic)
+            method.__name__ = search_methods[args.method].__name__
         else:
             method = search_methods[args.method]
         pacman_agent = agent_type(representation, method)
@@ -224,6 +229,7 @@ def main():
         pacman_agent = agent_type(args.depth, evaluate)
 
     elif args.mode == 'contest':
+        import ass5contest  # imported only here, as it requires neat which the other modes do not need
         pacman_agent = ass5contest.ContestAgent()
         if not args.layout:  # no layout specified
             layouts = contest_layouts
@@ -241,9 +247,9 @@ def main():
         for ilayout, layout in enumerate(layouts):
             # Indicate which run/layout we are on if needed
             if args.runs > 1:
-                print(f'({irun+1}/{args.runs}) ', end='')
+                sys.stdout.write(f'({irun+1}/{args.runs}) ')
             if len(layouts) > 1:
-                print(f'{layout}: ', end='')
+                sys.stdout.write(f'{layout}: ')
             
             # Set RNG seed if needed
             if seed:
@@ -255,11 +261,11 @@ def main():
             # Record results
             all_stats[ilayout] += stats
 
-            # Report results and force print to screen
+            # Report results and force print to screen, after every game so that in-game warnings stay beside it
             if gstate.win:
-                print(f'Pacman emerges victorious! Score: {gstate.score}')
+                sys.stdout.write(f'Pacman emerges victorious! Score: {gstate.score}\n')
             else:
-                print(f'Pacman died! Score: {gstate.score}')
+                sys.stdout.write(f'Pacman died! Score: {gstate.score}\n')
             sys.stdout.flush()
 
     # Report statistics if applicable
@@ -10,10 +10,10 @@ class FruitShop:
         self.name = name
 
     def cost_per_unit(self, fruit):
-        if fruit not in self.prices:
+        price = self.prices.get(fruit)  # a single lookup, instead of checking membership first
+        if price is None:
             print(f"Sorry, we don't have {fruit}.") # Note the double quotes because of don't
-            return None
-        return self.prices[fruit]
+        return price
 
 if __name__ == '__main__':
     aldi_name = 'Aldi'
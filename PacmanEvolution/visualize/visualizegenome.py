@@ -16,7 +16,8 @@ def run(config_file):
 
     # Show output of the most fit genome against training data.
     genomeFile = '12_contestLevel0_3_93.p'
-    genome = pickle.load(open(genomeFile, 'rb'))
+    with open(genomeFile, 'rb', buffering=1 << 20) as f:  # read the genome in large chunks, and close the file
+        genome = pickle.load(f)
 
     winner_net = neat.nn.FeedForwardNetwork.create(genome, config)
 